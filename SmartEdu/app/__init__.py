@@ -1,7 +1,13 @@
 # Flask App Initialization
-from flask import Flask
-from flask_login import LoginManager, current_user
-from .models import db, init_db, User
+from flask import Flask, flash, jsonify, redirect, request
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
+from flask_login import LoginManager, current_user, login_url
+from flask_migrate import Migrate
+from .models import db, configure_sqlite, init_db
+from .auth.identity import get_user_cache
+from .sessions import init_sessions
+from .fragments import FragmentCacheExtension
 import os
 from dotenv import load_dotenv
 
@@ -9,17 +15,51 @@ load_dotenv()
 
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
+migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache that never fails a page: a directory it can't write (a read-only
+    deploy holding precompiled templates, a full disk) is still read, just not filled"""
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
 
 def create_app():
     app = Flask(__name__, 
                 template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'),
                 static_folder=os.path.join(os.path.dirname(__file__), 'static'))
     app.config.from_object("config.Config")
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    # Behind a proxy every request comes from the proxy's address; take the client's from its headers
+    if app.config['PROXY_FIX_HOPS']:
+        hops = app.config['PROXY_FIX_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    # Compiled templates on disk: a new worker loads bytecode instead of parsing and compiling
+    cache_dir = app.config['TEMPLATE_CACHE_DIR']
+    if cache_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            app.logger.warning("Template bytecode cache disabled: can't create %s (%s)", cache_dir, e)
+        else:
+            app.jinja_env.bytecode_cache = TemplateBytecodeCache(cache_dir)
     
     # Session configuration
     app.secret_key = app.config['SECRET_KEY']
+    init_sessions(app)
 
     db.init_app(app)
+    configure_sqlite(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     login_manager.init_app(app)
     
     # Make current_user available in templates
@@ -27,20 +67,12 @@ def create_app():
     def inject_user():
         return {'current_user': current_user}
     
-    with app.app_context():
-        init_db(app)
-        # Ensure database schema is up to date
-        try:
-            from sqlalchemy import inspect, text
-            inspector = inspect(db.engine)
-            if 'book' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('book')]
-                if 'isbn' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE book ADD COLUMN isbn VARCHAR(20)"))
-                        conn.commit()
-        except Exception as e:
-            print(f"Schema update note: {e}")
+    # Development convenience; production boots skip all DDL and run `flask init-db` on deploy
+    if app.config['DB_AUTO_MIGRATE']:
+        from .catalog_import import ensure_catalog
+        with app.app_context():
+            init_db(app)
+            ensure_catalog()
 
     from .main.routes import main
     from .elearning.routes import elearning
@@ -52,8 +84,33 @@ def create_app():
     app.register_blueprint(elibrary, url_prefix="/elibrary")
     app.register_blueprint(auth, url_prefix="/auth")
 
+    from .commands import register_commands
+    register_commands(app)
+
+    # Rendered chapter cache: bound it, and optionally render every chapter up front
+    from .elibrary.render import chapter_cache, warm_chapter_cache
+    chapter_cache.resize(app.config['CHAPTER_CACHE_SIZE'], app.config['CHAPTER_CACHE_BYTES'])
+    if app.config['CHAPTER_CACHE_WARM']:
+        with app.app_context():
+            warm_chapter_cache()
+
     return app
 
+def load_templates(app):
+    """Load every template into the app's Jinja environment (and its bytecode cache); returns how many"""
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return get_user_cache().get(int(user_id))
+
+@login_manager.unauthorized_handler
+def unauthorized():
+    # fetch() follows the redirect to the login page and sees a 200, so API callers get a 401 instead
+    if '/api/' in request.path or request.accept_mimetypes.best == 'application/json':
+        return jsonify({'error': 'Please sign in to continue.'}), 401
+    flash(login_manager.login_message, login_manager.login_message_category)
+    return redirect(login_url(login_manager.login_view, request.url))
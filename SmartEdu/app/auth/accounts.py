@@ -0,0 +1,36 @@
+# Account Lookup
+from sqlalchemy import case, or_
+from sqlalchemy.dialects.sqlite import insert
+
+from ..models import User, account_key, db
+
+
+def find_login(identifier):
+    """The user whose username or email matches, ignoring case, in one indexed query.
+
+    A username match wins if one person's username is another's email.
+    """
+    key = account_key(identifier)
+    return (User.query
+            .filter(or_(User.username_key == key, User.email_key == key))
+            .order_by(case((User.username_key == key, 0), else_=1))
+            .first())
+
+
+def create_user(username, email, password, **profile):
+    """Insert a new user, or return (None, field) if the username or email is taken.
+
+    The unique indexes on the case-folded keys decide, so two concurrent signups
+    for the same name can't both succeed.
+    """
+    user = User(username=username.strip(), email=email.strip(), **profile)
+    user.set_password(password)
+    values = {column.key: getattr(user, column.key) for column in User.__table__.columns
+              if getattr(user, column.key) is not None}
+    result = db.session.execute(insert(User).values(values).on_conflict_do_nothing())
+    if not result.rowcount:
+        db.session.rollback()
+        taken = User.query.filter_by(username_key=user.username_key).first()
+        return None, 'username' if taken else 'email'
+    db.session.commit()
+    return db.session.get(User, result.inserted_primary_key[0]), None
@@ -0,0 +1,54 @@
+# Logged-in User Cache
+from flask_login import UserMixin
+
+from ..models import User, db
+from ..stores import TTLCache, app_singleton
+
+# The only user columns page templates and routes read for the logged-in user
+COLUMNS = ('id', 'username', 'full_name', 'profile_picture')
+
+
+class SessionUser(UserMixin):
+    """Read-only stand-in for the logged-in User, built from the slim projection.
+
+    Code that changes a user (the profile page) loads the full row with
+    ``db.session.get(User, current_user.id)`` and calls ``invalidate``.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self, row):
+        for name, value in zip(COLUMNS, row):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SessionUser is read-only; load the User row to change it")
+
+
+class UserCache(TTLCache):
+    """TTL + LRU map of user id to SessionUser for Flask-Login's user_loader.
+
+    Per worker: ``invalidate`` drops an entry in this process, and the TTL
+    bounds how long another worker can show a stale name or picture.
+    """
+
+    def __init__(self, maxsize=4096, ttl=30):
+        super().__init__(maxsize, ttl)
+
+    def get(self, user_id):
+        """SessionUser for an id, querying the slim projection on a miss; None if no such user"""
+        user = super().get(user_id)
+        if user is not None:
+            return user
+        columns = [getattr(User, name) for name in COLUMNS]
+        row = db.session.query(*columns).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        user = SessionUser(row)
+        self.set(user_id, user)
+        return user
+
+
+def get_user_cache():
+    """The per-process logged-in user cache for the current app"""
+    return app_singleton('user_cache', lambda config: UserCache(config['USER_CACHE_SIZE'], config['USER_CACHE_TTL']))
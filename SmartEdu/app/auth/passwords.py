@@ -0,0 +1,142 @@
+# Password Hashing Service
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+
+from flask import has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from ..stores import app_singleton
+
+
+class PasswordBusy(Exception):
+    """Raised instead of queueing when too many hashes are already waiting"""
+
+
+def _replacement_context():
+    # Forking a worker that is already serving requests can copy a lock another thread holds
+    # into the child; a pool rebuilt at that point starts its processes from a clean parent
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class PasswordHasher:
+    """Password hashing on a small pool of processes, off the request threads.
+
+    ``method`` is a werkzeug method string with its cost, e.g.
+    ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``. At most ``workers``
+    hashes run at once and ``max_queue`` more may wait; beyond that calls
+    fail fast with PasswordBusy. ``workers=0`` hashes in the calling thread.
+    """
+
+    def __init__(self, method='pbkdf2:sha256:600000', workers=2, max_queue=64, timeout=10):
+        self.method = method
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.hashed = 0
+        self.verified = 0
+        self.busy = 0
+        self._params = None
+        self._pending = 0
+        self._pool = None
+        self._pid = None
+        self._context = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        # Built lazily so each gunicorn worker gets its own pool
+        if self._pool is None or self._pid != os.getpid():
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=self._context)
+            self._pid = os.getpid()
+        return self._pool
+
+    def _done(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def start(self):
+        """Start the pool processes now, e.g. from gunicorn's post_worker_init before any threads exist"""
+        if self.workers > 0:
+            with self._lock:
+                executor = self._executor()
+            executor.submit(int).result()
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.busy += 1
+                raise PasswordBusy()
+            self._pending += 1
+            executor = self._executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            with self._lock:
+                self._pending -= 1
+            return self._rebuild(executor, fn, *args)
+        # Released when the hash really finishes: a timed-out hash keeps its process busy until then
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.busy += 1
+            raise PasswordBusy()
+        except BrokenProcessPool:
+            return self._rebuild(executor, fn, *args)
+
+    def _rebuild(self, executor, fn, *args):
+        # A pool process died; start a fresh pool next time and answer this one inline
+        with self._lock:
+            if self._pool is executor:
+                self._pool = None
+                self._context = _replacement_context()
+        return fn(*args)
+
+    def hash(self, password):
+        with self._lock:
+            self.hashed += 1
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        with self._lock:
+            self.verified += 1
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Whether a stored hash was made with a different method or cost than the configured one"""
+        if self._params is None:
+            # werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1"); one hash shows the full form
+            self._params = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._params
+
+    def stats(self):
+        with self._lock:
+            return {'method': self.method, 'workers': self.workers, 'max_queue': self.max_queue,
+                    'pending': self._pending, 'hashed': self.hashed, 'verified': self.verified,
+                    'busy': self.busy}
+
+
+def get_hasher():
+    """The per-process password hasher for the current app"""
+    return app_singleton('password_hasher', lambda config: PasswordHasher(
+        config['PASSWORD_HASH_METHOD'], config['PASSWORD_HASH_WORKERS'],
+        config['PASSWORD_HASH_QUEUE'], config['PASSWORD_HASH_TIMEOUT']))
+
+
+def hash_password(password):
+    if not has_app_context():  # scripts working on the models directly
+        return generate_password_hash(password)
+    return get_hasher().hash(password)
+
+
+def verify_password(pwhash, password):
+    if not has_app_context():
+        return check_password_hash(pwhash, password)
+    return get_hasher().verify(pwhash, password)
@@ -1,9 +1,21 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required
+from sqlalchemy.exc import IntegrityError
 from ..models import User, db
+from .accounts import find_login, create_user
+from .identity import get_user_cache
+from .passwords import PasswordBusy
 
 auth = Blueprint("auth", __name__)
 
+@auth.errorhandler(PasswordBusy)
+def password_busy(e):
+    flash("Lots of students are signing in right now. Please try again in a moment.", "danger")
+    template = {"auth.login": "login.html", "auth.signup": "signup.html"}.get(request.endpoint)
+    if template is None:
+        return redirect(url_for("auth.profile"))
+    return render_template(template), 503, {"Retry-After": "1"}
+
 @auth.route("/login", methods=["GET","POST"])
 def login():
     if request.method == "POST":
@@ -15,9 +27,13 @@ def login():
             flash("Please enter both username/email and password", "danger")
             return render_template("login.html")
         
-        u = User.query.filter_by(username=username).first() or User.query.filter_by(email=username).first()
+        u = find_login(username)
         
         if u and u.check_password(password):
+            # Hashes made under an older PASSWORD_HASH_METHOD are upgraded while we have the password
+            if u.password_needs_rehash():
+                u.set_password(password)
+                db.session.commit()
             login_user(u)
             flash(f"Welcome back, {u.full_name or u.username}!", "success")
             return redirect("/")
@@ -50,27 +66,22 @@ def signup():
             flash("Passwords do not match", "danger")
             return render_template("signup.html")
         
-        # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            flash("Username already exists. Please choose another.", "danger")
-            return render_template("signup.html")
-        
-        if User.query.filter_by(email=email).first():
-            flash("Email already registered. Please login instead.", "danger")
-            return render_template("signup.html")
-        
-        # Create new user
-        u = User(
-            username=username,
-            email=email,
+        # Create new user; the unique indexes reject a taken username or email
+        u, taken = create_user(
+            username,
+            email,
+            password,
             full_name=full_name or username,
             profile_picture=profile_picture,
             learning_goal=learning_goal,
             heard_from=heard_from
         )
-        u.set_password(password)
-        db.session.add(u)
-        db.session.commit()
+        if taken == 'username':
+            flash("Username already exists. Please choose another.", "danger")
+            return render_template("signup.html")
+        if taken == 'email':
+            flash("Email already registered. Please login instead.", "danger")
+            return render_template("signup.html")
         login_user(u)
         flash(f"Welcome, {u.full_name}! Your account has been created.", "success")
         return redirect("/")
@@ -81,6 +92,9 @@ def signup():
 def profile():
     from flask_login import current_user
     
+    # current_user is the cached slim projection; edits go through the full row
+    user = db.session.get(User, current_user.id)
+    
     if request.method == "POST":
         action = request.form.get("action")
         
@@ -91,15 +105,16 @@ def profile():
             profile_picture = request.form.get("profile_picture")
             
             if full_name:
-                current_user.full_name = full_name
+                user.full_name = full_name
             if learning_goal:
-                current_user.learning_goal = learning_goal
+                user.learning_goal = learning_goal
             if heard_from:
-                current_user.heard_from = heard_from
+                user.heard_from = heard_from
             if profile_picture:
-                current_user.profile_picture = profile_picture
+                user.profile_picture = profile_picture
             
             db.session.commit()
+            get_user_cache().invalidate(user.id)
             flash("Profile updated successfully!", "success")
             return redirect(url_for("auth.profile"))
         
@@ -108,7 +123,7 @@ def profile():
             new_password = request.form.get("new_password")
             confirm_password = request.form.get("confirm_password")
             
-            if not current_user.check_password(old_password):
+            if not user.check_password(old_password):
                 flash("Current password is incorrect", "danger")
                 return redirect(url_for("auth.profile"))
             
@@ -120,8 +135,9 @@ def profile():
                 flash("New passwords do not match", "danger")
                 return redirect(url_for("auth.profile"))
             
-            current_user.set_password(new_password)
+            user.set_password(new_password)
             db.session.commit()
+            get_user_cache().invalidate(user.id)
             flash("Password changed successfully!", "success")
             return redirect(url_for("auth.profile"))
         
@@ -132,16 +148,18 @@ def profile():
                 flash("Username cannot be empty", "danger")
                 return redirect(url_for("auth.profile"))
             
-            if User.query.filter_by(username=new_username).first():
+            user.username = new_username
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
                 flash("Username already taken", "danger")
                 return redirect(url_for("auth.profile"))
-            
-            current_user.username = new_username
-            db.session.commit()
+            get_user_cache().invalidate(user.id)
             flash("Username changed successfully!", "success")
             return redirect(url_for("auth.profile"))
     
-    return render_template("profile.html")
+    return render_template("profile.html", user=user)
 
 @auth.route("/logout")
 @login_required
@@ -0,0 +1,179 @@
+# Catalog Content Store
+# Courses, books, modules and quizzes are looked up by slug per request instead of
+# living in module-level dicts, so workers share SQLite pages through the OS page
+# cache and the catalog can be reloaded from data/catalog.json without a redeploy.
+import json
+
+from .models import db, Course, Book, Chapter, Module, Quiz
+
+SHARED_COURSE = '*'  # Module.course_id for modules every course uses
+ANSWER_LETTERS = 'abcd'
+
+
+def course_dict(course):
+    return {
+        'name': course.title,
+        'instructor': course.instructor,
+        'level': course.level,
+        'category': course.category,
+        'emoji': course.emoji,
+        'description': course.description,
+    }
+
+
+def book_dict(book):
+    return {
+        'title': book.title,
+        'author': book.author,
+        'category': book.category,
+        'pages': book.pages,
+        'rating': book.rating,
+        'isbn': book.isbn,
+        'description': book.description,
+        'version': book.version,
+    }
+
+
+def module_dict(module, quizzes):
+    return {
+        'id': module.id,
+        'version': module.version,
+        'name': f'Module {module.order}: {module.title}',
+        'title': module.title,
+        'description': module.description,
+        'information': module.information,
+        'video_url': module.video_url,
+        'video_duration': module.video_duration,
+        'learning_objectives': json.loads(module.learning_objectives or '[]'),
+        'quiz_questions': [
+            {
+                'question': q.question,
+                'options': [q.option_a, q.option_b, q.option_c, q.option_d],
+                'correct': ANSWER_LETTERS.index(q.correct_answer),
+                'explanation': q.explanation,
+            }
+            for q in quizzes
+        ],
+    }
+
+
+def course_card(course):
+    """The fields the course grid renders, in the shape of the old coursesData entries"""
+    return {
+        'id': course.slug,
+        'name': course.title,
+        'instructor': course.instructor,
+        'level': course.level,
+        'emoji': course.emoji,
+        'category': course.category,
+        'desc': course.description,
+    }
+
+
+def book_card(book):
+    return {
+        'id': book.slug,
+        'title': book.title,
+        'author': book.author,
+        'category': book.category,
+        'pages': book.pages,
+        'rating': book.rating,
+        'description': book.description,
+    }
+
+
+def get_course(slug):
+    """Course by slug, or None"""
+    course = Course.query.filter_by(slug=slug).first()
+    return course_dict(course) if course else None
+
+
+def get_book(slug):
+    """Book metadata by slug (without chapters), or None"""
+    book = Book.query.filter_by(slug=slug).first()
+    return book_dict(book) if book else None
+
+
+def get_chapter(book_slug, number):
+    """Chapter title and markdown for one page of a book, or None"""
+    chapter = (Chapter.query.join(Book, Chapter.book_id == Book.id)
+               .filter(Book.slug == book_slug, Chapter.number == number)
+               .first())
+    if not chapter:
+        return None
+    return {'title': chapter.title, 'content': chapter.content}
+
+
+def get_chapter_titles(book_slug):
+    """(number, title) for every chapter of a book, in order, read from the chapter table of contents index"""
+    rows = (db.session.query(Chapter.number, Chapter.title)
+            .join(Book, Chapter.book_id == Book.id)
+            .filter(Book.slug == book_slug)
+            .order_by(Chapter.number))
+    return [tuple(row) for row in rows]
+
+
+def iter_chapters():
+    """Yield (book_slug, number, markdown) for every stored chapter"""
+    rows = (db.session.query(Book.slug, Chapter.number, Chapter.content)
+            .join(Chapter, Chapter.book_id == Book.id))
+    for row in rows:
+        yield row.slug, row.number, row.content
+
+
+def _module_query(query, course_slug, module_slug):
+    # A course's own module wins over the shared track's module of the same id
+    return (query
+            .filter(Module.module_id == module_slug,
+                    Module.course_id.in_([course_slug, SHARED_COURSE]))
+            .order_by(Module.course_id == SHARED_COURSE))
+
+
+def get_module(course_slug, module_slug):
+    """Module details for a course, falling back to the shared module track"""
+    module = _module_query(Module.query, course_slug, module_slug).first()
+    if not module:
+        return None
+    quizzes = Quiz.query.filter_by(module_id=module.id).order_by(Quiz.order).all()
+    return module_dict(module, quizzes)
+
+
+def get_book_version(slug):
+    """A book's content version, or None if there is no such book.
+
+    The counter moves whenever the book or any of its chapters changes, so
+    it stands in for the page content without reading any chapter text.
+    """
+    return db.session.query(Book.version).filter_by(slug=slug).scalar()
+
+
+def get_module_version(course_slug, module_slug):
+    """(course version, module version) for a module page, or None if there is no such course"""
+    course = db.session.query(Course.version).filter_by(slug=course_slug).scalar()
+    if course is None:
+        return None
+    module = _module_query(db.session.query(Module.version), course_slug, module_slug).first()
+    return course, module[0] if module else 0
+
+
+def _page(model, card, after, limit, filters):
+    # Keyset pagination: "id > cursor" stays an index range scan however deep the page
+    query = model.query.filter(model.slug.isnot(None))
+    for column, value in filters.items():
+        if value:
+            query = query.filter(getattr(model, column) == value)
+    if after:
+        query = query.filter(model.id > after)
+    rows = query.order_by(model.id).limit(limit + 1).all()
+    cursor = rows[limit - 1].id if len(rows) > limit else None
+    return [card(row) for row in rows[:limit]], cursor
+
+
+def course_page(after=None, limit=24, level=None, category=None):
+    """One page of course cards after a cursor; returns (cards, next cursor or None)"""
+    return _page(Course, course_card, after, limit, {'level': level, 'category': category})
+
+
+def book_page(after=None, limit=24, category=None):
+    """One page of book cards after a cursor; returns (cards, next cursor or None)"""
+    return _page(Book, book_card, after, limit, {'category': category})
@@ -0,0 +1,274 @@
+# Catalog Import
+# Streams catalog records from a JSON, JSONL or CSV file and writes them as chunked
+# executemany upserts, one short transaction per chunk, so workers keep serving
+# pages from the same SQLite file while thousands of rows load.
+import csv
+import json
+import os
+import time
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+
+from .catalog import SHARED_COURSE, ANSWER_LETTERS
+from .models import db, Course, Book, Chapter, Module, Quiz
+
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'catalog.json')
+
+# Accepted fields per record type and how to coerce them (CSV values arrive as strings)
+FIELDS = {
+    'course': {'slug': str, 'title': str, 'instructor': str, 'level': str, 'category': str, 'emoji': str,
+               'description': str, 'duration': str, 'price': float, 'rating': float, 'students': int},
+    'book': {'slug': str, 'title': str, 'author': str, 'category': str, 'description': str, 'isbn': str,
+             'pages': int, 'rating': float, 'chapters': list},
+    'chapter': {'book': str, 'number': int, 'title': str, 'content': str},
+    'module': {'slug': str, 'course_id': str, 'order': int, 'title': str, 'description': str,
+               'information': str, 'video_url': str, 'video_duration': str,
+               'learning_objectives': list, 'quiz': list},
+}
+REQUIRED = {'course': ('slug', 'title'), 'book': ('slug', 'title'),
+            'chapter': ('book', 'number', 'title'), 'module': ('slug', 'title')}
+KINDS = tuple(FIELDS)
+
+
+def read_records(path, kind=None):
+    """Yield (location, record type, record) from a catalog file without loading it all.
+
+    ``.jsonl`` files hold one object per line and ``.csv`` files one row per
+    line, each with a ``type`` column or the given ``kind``. Any other file
+    is read as the bundled catalog.json layout.
+    """
+    name = os.path.basename(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            for line, row in enumerate(csv.DictReader(f), 2):
+                record = {key: value for key, value in row.items() if key and value not in (None, '')}
+                yield f'{name}:{line}', record.pop('type', kind), record
+        elif path.endswith('.jsonl'):
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as e:
+                    yield f'{name}:{line}', kind, f'not valid JSON ({e})'
+                    continue
+                yield f'{name}:{line}', record.pop('type', kind) if isinstance(record, dict) else kind, record
+        else:
+            data = json.load(f)
+            for key, record_type in (('courses', 'course'), ('books', 'book'), ('modules', 'module')):
+                for index, record in enumerate(data.get(key, [])):
+                    yield f'{name}:{key}[{index}]', record_type, record
+
+
+def _coerce(cast, value):
+    if cast is list and isinstance(value, str):
+        value = json.loads(value)  # a JSON array inside a CSV cell
+    if cast is list and not isinstance(value, list):
+        raise ValueError('expected a list')
+    return value if cast is list else cast(value)
+
+
+def clean(kind, record):
+    """Validate one record, returning it with coerced values or raising ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError(record if isinstance(record, str) else 'expected an object')
+    if kind not in FIELDS:
+        raise ValueError(f'unknown record type {kind!r}')
+    fields = FIELDS[kind]
+    unknown = sorted(set(record) - set(fields))
+    if unknown:
+        raise ValueError(f'unknown field(s) {", ".join(unknown)}')
+    missing = [field for field in REQUIRED[kind] if record.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f'missing {", ".join(missing)}')
+    values = {}
+    for field, value in record.items():
+        try:
+            values[field] = None if value is None else _coerce(fields[field], value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be {fields[field].__name__}, got {value!r}')
+    for question in values.get('quiz') or []:
+        options = question.get('options') if isinstance(question, dict) else None
+        if not options or len(options) != 4 or not question.get('question'):
+            raise ValueError('quiz questions need a question and four options')
+        if question.get('correct') not in range(4):
+            raise ValueError('quiz answers must be an option index from 0 to 3')
+    return values
+
+
+def _upsert(model, rows, keys):
+    """executemany an INSERT .. ON CONFLICT(keys) DO UPDATE for rows sharing one set of fields"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for columns, group in groups.items():
+        stmt = insert(model)
+        updates = {column: stmt.excluded[column] for column in columns if column not in keys}
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates) if updates \
+            else stmt.on_conflict_do_nothing(index_elements=keys)
+        db.session.execute(stmt, group)
+
+
+class CatalogImporter:
+    """Buffers validated records and writes them ``chunk_size`` at a time.
+
+    Each chunk is one transaction: courses, then books, then chapters (which
+    need their book's id), then modules and their quiz questions. Courses
+    and modules upsert on their slug, books on ISBN when they have one and
+    on slug otherwise, chapters on (book, number). A chunk that hits a
+    constraint is retried row by row so one bad record doesn't sink the rest.
+    """
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.counts = dict.fromkeys(('courses', 'books', 'chapters', 'modules', 'quizzes'), 0)
+        self.errors = []
+        self._pending = {kind: [] for kind in KINDS}
+        self._size = 0
+        self._book_ids = {}
+
+    def add(self, where, kind, record):
+        try:
+            values = clean(kind, record)
+        except ValueError as e:
+            self.errors.append((where, str(e)))
+            return
+        chapters = values.pop('chapters', None) if kind == 'book' else None
+        self._pending[kind].append((where, values))
+        self._size += 1
+        for chapter in chapters or []:
+            self.add(where, 'chapter', dict(chapter, book=values['slug']) if isinstance(chapter, dict) else chapter)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._size:
+            return
+        pending, self._pending, self._size = self._pending, {kind: [] for kind in KINDS}, 0
+        try:
+            counts, errors = self._write(pending)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            # Ids looked up inside the rolled-back chunk may belong to books that no longer exist
+            self._book_ids.clear()
+            counts, errors = self._write_rows(pending)
+        for name, count in counts.items():
+            self.counts[name] += count
+        self.errors.extend(errors)
+
+    def _write_rows(self, pending):
+        # Slow path: find the offending rows by writing each in its own savepoint
+        counts, errors = dict.fromkeys(self.counts, 0), []
+        for kind in KINDS:
+            for where, values in pending[kind]:
+                single = {k: [] for k in KINDS}
+                single[kind].append((where, values))
+                try:
+                    with db.session.begin_nested():
+                        row_counts, row_errors = self._write(single)
+                except IntegrityError as e:
+                    errors.append((where, f'conflicts with an existing row ({e.orig})'))
+                    continue
+                for name, count in row_counts.items():
+                    counts[name] += count
+                errors.extend(row_errors)
+        db.session.commit()
+        return counts, errors
+
+    def _write(self, pending):
+        """Write one chunk in the current transaction; returns (counts, errors)"""
+        counts, errors = dict.fromkeys(self.counts, 0), []
+        courses = [values for _, values in pending['course']]
+        _upsert(Course, courses, ['slug'])
+        counts['courses'] = len(courses)
+
+        books = [values for _, values in pending['book']]
+        _upsert(Book, [b for b in books if b.get('isbn')], ['isbn'])
+        _upsert(Book, [b for b in books if not b.get('isbn')], ['slug'])
+        counts['books'] = len(books)
+
+        if pending['chapter']:
+            counts['chapters'] = self._write_chapters(pending['chapter'], errors)
+        if pending['module']:
+            counts['modules'], counts['quizzes'] = self._write_modules([values for _, values in pending['module']])
+        return counts, errors
+
+    def _resolve_books(self, names):
+        missing = list({name for name in names if name not in self._book_ids})
+        for start in range(0, len(missing), 400):  # stay under SQLite's bound-parameter limit
+            batch = missing[start:start + 400]
+            rows = db.session.query(Book.id, Book.slug, Book.isbn).filter(
+                Book.slug.in_(batch) | Book.isbn.in_(batch))
+            for book_id, slug, isbn in rows:
+                self._book_ids[slug] = book_id
+                if isbn:
+                    self._book_ids[isbn] = book_id
+
+    def _write_chapters(self, chapters, errors):
+        self._resolve_books([values['book'] for _, values in chapters])
+        rows = []
+        for where, values in chapters:
+            book_id = self._book_ids.get(values['book'])
+            if book_id is None:
+                errors.append((where, f"no book with slug or ISBN {values['book']!r}"))
+                continue
+            rows.append({'book_id': book_id, **{k: v for k, v in values.items() if k != 'book'}})
+        _upsert(Chapter, rows, ['book_id', 'number'])
+        return len(rows)
+
+    def _write_modules(self, modules):
+        quizzes = {}
+        rows = []
+        for values in modules:
+            row = {k: v for k, v in values.items() if k not in ('slug', 'quiz')}
+            row['module_id'] = values['slug']
+            row.setdefault('course_id', SHARED_COURSE)
+            if 'learning_objectives' in row:
+                row['learning_objectives'] = json.dumps(row['learning_objectives'] or [])
+            if values.get('quiz') is not None:
+                quizzes[(row['course_id'], row['module_id'])] = values['quiz']
+            rows.append(row)
+        _upsert(Module, rows, ['course_id', 'module_id'])
+        if not quizzes:
+            return len(rows), 0
+
+        keys = list(quizzes)
+        ids = {}
+        for start in range(0, len(keys), 400):
+            query = db.session.query(Module.id, Module.course_id, Module.module_id).filter(
+                tuple_(Module.course_id, Module.module_id).in_(keys[start:start + 400]))
+            ids.update(((course, slug), module_id) for module_id, course, slug in query)
+        # Quiz rows have no natural key, so a module's questions are replaced wholesale
+        module_ids = list(ids.values())
+        for start in range(0, len(module_ids), 400):
+            db.session.query(Quiz).filter(Quiz.module_id.in_(module_ids[start:start + 400])).delete(
+                synchronize_session=False)
+        questions = [{'module_id': ids[key], 'question': q['question'],
+                      'option_a': q['options'][0], 'option_b': q['options'][1],
+                      'option_c': q['options'][2], 'option_d': q['options'][3],
+                      'correct_answer': ANSWER_LETTERS[q['correct']], 'explanation': q.get('explanation'),
+                      'order': order}
+                     for key, quiz in quizzes.items() for order, q in enumerate(quiz, 1)]
+        if questions:
+            db.session.execute(insert(Quiz), questions)
+        return len(rows), len(questions)
+
+
+def load_catalog(path=CATALOG_FILE, kind=None, chunk_size=1000):
+    """Insert or update every record in a catalog file; returns counts, errors and timing"""
+    start = time.perf_counter()
+    importer = CatalogImporter(chunk_size)
+    for where, record_type, record in read_records(path, kind):
+        importer.add(where, record_type, record)
+    importer.flush()
+    return dict(importer.counts, errors=importer.errors, seconds=time.perf_counter() - start)
+
+
+def ensure_catalog():
+    """Load the bundled catalog into an empty database"""
+    # Upserts make a second worker booting at the same moment load it harmlessly
+    if db.session.query(Course.id).filter(Course.slug.isnot(None)).first() is None:
+        load_catalog()
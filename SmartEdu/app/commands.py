@@ -0,0 +1,47 @@
+# CLI Commands
+import time
+
+import click
+
+from .catalog_import import CATALOG_FILE, KINDS, ensure_catalog, load_catalog
+from .models import init_db
+from . import load_templates
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Apply pending migrations and load the bundled catalog into an empty database."""
+        init_db(app)
+        ensure_catalog()
+        click.echo("✓ Database schema is up to date")
+
+    @app.cli.command('load-catalog')
+    @click.argument('path', default=CATALOG_FILE)
+    @click.option('--kind', type=click.Choice(KINDS), help='Record type for CSV/JSONL rows without a "type" field.')
+    @click.option('--chunk-size', default=1000, show_default=True, help='Records written per transaction.')
+    def load_catalog_command(path, kind, chunk_size):
+        """Insert or update courses, books, chapters and modules from a JSON, JSONL or CSV file."""
+        result = load_catalog(path, kind, chunk_size)
+        for where, message in result['errors'][:20]:
+            click.echo(f"✗ {where}: {message}", err=True)
+        if len(result['errors']) > 20:
+            click.echo(f"✗ ... and {len(result['errors']) - 20} more rejected records", err=True)
+        rows = sum(result[name] for name in ('courses', 'books', 'chapters', 'modules', 'quizzes'))
+        click.echo(f"✓ Loaded {result['courses']} courses, {result['books']} books, {result['chapters']} chapters, "
+                   f"{result['modules']} modules, {result['quizzes']} quiz questions")
+        click.echo(f"  {rows} rows in {result['seconds']:.2f}s ({rows / max(result['seconds'], 1e-9):,.0f} rows/s)")
+        if result['errors']:
+            raise SystemExit(1)
+
+    @app.cli.command('precompile-templates')
+    def precompile_templates_command():
+        """Compile every template into TEMPLATE_CACHE_DIR so new workers skip the Jinja compiler."""
+        cache = app.jinja_env.bytecode_cache
+        if cache is None:
+            raise click.ClickException("TEMPLATE_CACHE_DIR is empty; there is no bytecode cache to fill")
+        cache.clear()  # compiled output also depends on Jinja and our extensions, not just the source
+        started = time.perf_counter()
+        count = load_templates(app)
+        click.echo(f"✓ Compiled {count} templates into {app.config['TEMPLATE_CACHE_DIR']} "
+                   f"in {time.perf_counter() - started:.2f}s")
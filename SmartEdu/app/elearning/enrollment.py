@@ -0,0 +1,46 @@
+# Course Enrollment
+from datetime import datetime
+
+from flask import session
+from sqlalchemy.dialects.sqlite import insert
+
+from ..catalog import course_card
+from ..models import db, Course, Enrollment
+
+
+def _migrate_session(user):
+    """Move enrollments made before they were stored in the database out of the session cookie"""
+    legacy = session.pop('enrolled_courses', None)
+    if legacy:
+        _insert(user.id, legacy)
+        db.session.commit()
+
+
+def _insert(user_id, course_ids):
+    now = datetime.utcnow()
+    rows = [{'user_id': user_id, 'course_id': course_id, 'created_at': now} for course_id in course_ids]
+    # The (user_id, course_id) unique index makes enrolling twice a no-op
+    db.session.execute(insert(Enrollment).values(rows).on_conflict_do_nothing())
+
+
+def is_enrolled(user, course_id):
+    """Whether a user is enrolled in a course; a single unique-index lookup"""
+    if not user.is_authenticated:
+        return False
+    _migrate_session(user)
+    return db.session.query(Enrollment.id).filter_by(user_id=user.id, course_id=course_id).first() is not None
+
+
+def enroll(user, course_id):
+    _migrate_session(user)
+    _insert(user.id, [course_id])
+    db.session.commit()
+
+
+def my_courses(user):
+    """Course cards for every course a user is enrolled in, most recent first, in one query"""
+    _migrate_session(user)
+    rows = (Course.query.join(Enrollment, Enrollment.course_id == Course.slug)
+            .filter(Enrollment.user_id == user.id)
+            .order_by(Enrollment.created_at.desc(), Enrollment.id.desc()))
+    return [course_card(course) for course in rows]
@@ -0,0 +1,175 @@
+# Progress Write-Behind Queue
+import atexit
+from datetime import datetime
+import logging
+import queue
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+
+from ..models import db, UserProgress
+from ..stores import app_singleton
+
+PASS_MARK = 70
+
+
+def _upsert():
+    """INSERT ... ON CONFLICT(user_id, module_id) that only ever moves progress forward.
+
+    Keeping the best score, OR-ing completion and keeping the first
+    completion time makes replaying or reordering writes harmless.
+    """
+    stmt = insert(UserProgress)
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=['user_id', 'module_id'],
+        set_={
+            'quiz_score': func.nullif(func.max(func.coalesce(UserProgress.quiz_score, -1),
+                                               func.coalesce(new.quiz_score, -1)), -1),
+            'completed': func.max(UserProgress.completed, new.completed),
+            'completed_at': func.coalesce(UserProgress.completed_at, new.completed_at),
+        },
+    )
+
+
+def progress_row(user_id, module_id, quiz_score=None, completed=False):
+    now = datetime.utcnow()
+    completed = bool(completed or (quiz_score is not None and quiz_score >= PASS_MARK))
+    return {'user_id': user_id, 'module_id': module_id, 'quiz_score': quiz_score,
+            'completed': completed, 'completed_at': now if completed else None, 'created_at': now}
+
+
+def _merge(rows):
+    """Collapse several writes for the same student and module into one row"""
+    merged = {}
+    for row in rows:
+        key = (row['user_id'], row['module_id'])
+        old = merged.get(key)
+        if old is None:
+            merged[key] = row
+            continue
+        scores = [s for s in (old['quiz_score'], row['quiz_score']) if s is not None]
+        old['quiz_score'] = max(scores) if scores else None
+        old['completed'] = old['completed'] or row['completed']
+        old['completed_at'] = old['completed_at'] or row['completed_at']
+    return list(merged.values())
+
+
+def write_progress(engine, rows):
+    """Upsert progress rows in a single transaction"""
+    with engine.begin() as conn:
+        conn.execute(_upsert(), _merge(rows))
+
+
+class ProgressWriter:
+    """Write-behind queue for UserProgress.
+
+    ``record`` only enqueues; a background thread drains whatever has
+    arrived, waiting at most ``flush_interval`` for more, and commits up to
+    ``batch_size`` rows per transaction. A burst of end-of-class
+    submissions becomes a handful of SQLite commits instead of one fsync
+    per request. Queued rows are flushed at interpreter exit.
+
+    A batch that fails (the database is locked, say) is retried up to
+    ``retries`` times with a growing pause; if it still fails, its rows are
+    written one at a time so a single bad row loses only itself.
+    """
+
+    RETRY_DELAY = 0.5  # seconds before the first retry; doubled for each one after
+
+    def __init__(self, engine, batch_size=500, flush_interval=0.05, retries=3, logger=None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.logger = logger or logging.getLogger(__name__)
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.retried = 0
+        self.dropped = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='progress-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def record(self, user_id, module_id, quiz_score=None, completed=False):
+        self._queue.put(progress_row(user_id, module_id, quiz_score, completed))
+
+    def flush(self, timeout=5):
+        """Block until everything queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _collect(self):
+        """The next batch of rows plus any flush() waiters queued among them"""
+        rows, waiters = [], []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                rows.append(item)
+            if len(rows) >= self.batch_size:
+                return rows, waiters
+            try:
+                item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                return rows, waiters
+
+    def _write(self, rows):
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+                time.sleep(self.RETRY_DELAY * 2 ** (attempt - 1))
+            try:
+                write_progress(self.engine, rows)
+            except Exception:
+                self.errors += 1
+                self.logger.warning("Progress write failed (%d rows, attempt %d of %d)",
+                                    len(rows), attempt + 1, self.retries + 1, exc_info=True)
+                continue
+            self.written += len(rows)
+            self.batches += 1
+            return
+
+        # Still failing: write row by row so the rest of the batch isn't lost with a bad row
+        for row in rows:
+            try:
+                write_progress(self.engine, [row])
+            except Exception:
+                self.dropped += 1
+                self.logger.exception("Dropped progress row for user %s, module %s",
+                                      row['user_id'], row['module_id'])
+            else:
+                self.written += 1
+                self.batches += 1
+
+    def _run(self):
+        while True:
+            rows, waiters = self._collect()
+            if rows:
+                self._write(rows)
+            for waiter in waiters:
+                waiter.set()
+
+    def stats(self):
+        return {'queued': self._queue.qsize(), 'written': self.written, 'batches': self.batches,
+                'errors': self.errors, 'retried': self.retried, 'dropped': self.dropped}
+
+
+def record_progress(user_id, module_id, quiz_score=None, completed=False):
+    """Save a quiz score or module completion, through the write-behind queue when enabled"""
+    config = current_app.config
+    if not config['PROGRESS_WRITE_BEHIND']:
+        write_progress(db.engine, [progress_row(user_id, module_id, quiz_score, completed)])
+        return
+    writer = app_singleton('progress_writer', lambda config: ProgressWriter(
+        db.engine, config['PROGRESS_BATCH_SIZE'], config['PROGRESS_FLUSH_INTERVAL'],
+        config['PROGRESS_RETRIES'], current_app.logger))
+    writer.record(user_id, module_id, quiz_score, completed)
@@ -0,0 +1,51 @@
+# E-Library Full-Text Search
+# Chapter text is indexed in the chapter_fts FTS5 table (migration 0005), which
+# triggers keep current as chapters are added, edited or removed. Matching,
+# ranking and snippets all happen inside SQLite.
+import re
+
+from markupsafe import escape, Markup
+from sqlalchemy import text
+
+from ..models import db
+
+_WORD = re.compile(r"\w+")
+TITLE_WEIGHT = 5.0  # a hit in a chapter title ranks above one in its body
+SNIPPET_WORDS = 16
+_OPEN, _CLOSE = '\x02', '\x03'  # highlight markers, swapped for <mark> after escaping
+
+_FROM = """FROM chapter_fts
+           JOIN chapter ON chapter.id = chapter_fts.rowid
+           JOIN book ON book.id = chapter.book_id
+           WHERE chapter_fts MATCH :query AND (:book IS NULL OR book.slug = :book)"""
+
+
+def fts_query(text):
+    """An FTS5 query matching every word of free text as a whole word or prefix.
+
+    Words are quoted, so punctuation and FTS5 operators in the input are
+    never parsed as query syntax.
+    """
+    return ' '.join(f'"{word}"*' for word in _WORD.findall(text.casefold()))
+
+
+def _highlight(snippet):
+    return Markup(str(escape(snippet)).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>'))
+
+
+def search_chapters(query, book=None, limit=20, offset=0):
+    """Return (total hits, ranked hits) for chapters matching ``query``, optionally within one book"""
+    match = fts_query(query)
+    if not match:
+        return 0, []
+    params = {'query': match, 'book': book}
+    total = db.session.execute(text(f"SELECT COUNT(*) {_FROM}"), params).scalar()
+    rows = db.session.execute(text(f"""
+        SELECT book.slug, book.title, chapter.number, chapter.title,
+               snippet(chapter_fts, 1, :open, :close, '…', {SNIPPET_WORDS})
+        {_FROM}
+        ORDER BY bm25(chapter_fts, {TITLE_WEIGHT}, 1.0)
+        LIMIT :limit OFFSET :offset"""), dict(params, open=_OPEN, close=_CLOSE, limit=limit, offset=offset))
+    return total, [{'book': slug, 'book_title': book_title, 'chapter': number, 'title': title,
+                    'snippet': _highlight(snippet)}
+                   for slug, book_title, number, title, snippet in rows]
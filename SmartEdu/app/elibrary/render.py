@@ -0,0 +1,181 @@
+# E-Library Chapter Rendering
+from collections import OrderedDict
+import hashlib
+import re
+import threading
+
+import markdown
+from markdown.extensions import Extension
+from markdown.postprocessors import Postprocessor
+from markupsafe import Markup
+
+from ..catalog import iter_chapters
+
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code']
+
+
+TABLE_STYLE = 'width: 100%; border-collapse: collapse; margin: 1.5rem 0; border: 2px solid #ddd; background: #f9f9f9;'
+THEAD_STYLE = 'background: #e8e8e8;'
+TH_STYLE = 'padding: 1rem; text-align: left; font-weight: 700; border-bottom: 3px solid #333; color: #000;'
+TD_STYLE = 'padding: 0.75rem 1rem; color: #000; border-bottom: 1px solid #ddd;'
+ROW_BACKGROUNDS = ('#ffffff', '#f5f5f5')
+ROW_TAGS = tuple(f'<tr style="background: {background}; border-bottom: 1px solid #ddd;">'
+                 for background in ROW_BACKGROUNDS)
+
+# Every opening tag the styler rewrites, as the tables extension writes it, mapped to its styled form
+STYLED_TAGS = {}
+for _tag, _style in (('table', TABLE_STYLE), ('thead', THEAD_STYLE), ('th', TH_STYLE), ('td', TD_STYLE)):
+    STYLED_TAGS[f'<{_tag}>'] = f'<{_tag} style="{_style}">'
+    STYLED_TAGS[f'<{_tag} style="'] = f'<{_tag} style="{_style} '  # keep the alignment style after ours
+_TABLE_TAGS = re.compile(r'(<(?:t(?:able|head|h|d)(?:>| style=")|tbody>|tr>|/tbody>))')
+
+
+class TableStylePostprocessor(Postprocessor):
+    """Add inline styles to every table in the rendered HTML.
+
+    One pass: a single regex split finds every table tag, each is swapped
+    for its styled form, and body rows alternate colours, restarting in each
+    tbody. It runs before raw HTML is put back, so only tables written in
+    markdown are styled.
+    """
+
+    def run(self, text):
+        if '<table>' not in text:
+            return text
+        parts = _TABLE_TAGS.split(text)
+        row = -1  # -1 outside a tbody, where rows (the header's) stay plain
+        for index in range(1, len(parts), 2):
+            tag = parts[index]
+            if tag == '<tr>':
+                if row >= 0:
+                    parts[index] = ROW_TAGS[row % 2]
+                    row += 1
+            elif tag == '<tbody>':
+                row = 0
+            elif tag == '</tbody>':
+                row = -1
+            else:
+                parts[index] = STYLED_TAGS[tag]
+        return ''.join(parts)
+
+
+class TableStyleExtension(Extension):
+    """Markdown extension registering the table style postprocessor"""
+
+    def extendMarkdown(self, md):
+        # Above raw_html (30), while any HTML typed into the chapter is still stashed
+        md.postprocessors.register(TableStylePostprocessor(md), 'table_styles', 35)
+
+
+_local = threading.local()
+
+
+def _markdown():
+    """Per-thread Markdown instance; building one per call reloads every extension"""
+    md = getattr(_local, 'md', None)
+    if md is None:
+        md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS + [TableStyleExtension()])
+        _local.md = md
+    return md
+
+
+def render_markdown(text):
+    """Convert chapter markdown into styled HTML"""
+    return _markdown().reset().convert(text)
+
+
+def content_hash(text):
+    """Stable digest of chapter markdown used to detect edits"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ChapterCache:
+    """Bounded LRU cache of rendered chapter HTML.
+
+    Entries are keyed by (book_id, chapter) and remember the hash of the
+    markdown they were rendered from, so an edited chapter is re-rendered
+    on its next request and the stale HTML is replaced in place. Both the
+    entry count and the total HTML size are capped, so a library of long
+    textbooks costs a worker no more memory than a handful of short ones.
+    """
+
+    def __init__(self, maxsize=256, maxbytes=32 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, book_id, chapter, text):
+        """Return cached HTML for this chapter, rendering it on a miss"""
+        key = (book_id, chapter)
+        digest = content_hash(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == digest:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        html = Markup(render_markdown(text))
+
+        if len(html) > self.maxbytes:
+            return html  # bigger than the whole cache; render it each time rather than evict everything
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (digest, html)
+            self._bytes += len(html)
+            self._evict()
+        return html
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize or self._bytes > self.maxbytes:
+            _, (_, html) = self._entries.popitem(last=False)
+            self._bytes -= len(html)
+
+    def invalidate(self, book_id=None, chapter=None):
+        """Drop cached chapters for one book/chapter, or everything"""
+        with self._lock:
+            if book_id is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in list(self._entries):
+                if key[0] == book_id and (chapter is None or key[1] == chapter):
+                    self._bytes -= len(self._entries.pop(key)[1])
+
+    def resize(self, maxsize, maxbytes=None):
+        with self._lock:
+            self.maxsize = maxsize
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize,
+                    'bytes': self._bytes, 'maxbytes': self.maxbytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+chapter_cache = ChapterCache()
+
+
+def render_chapter(book_id, chapter, text):
+    """Rendered, cached HTML for one chapter of a book"""
+    return chapter_cache.get(book_id, chapter, text)
+
+
+def warm_chapter_cache():
+    """Pre-render every stored chapter into the cache"""
+    count = 0
+    for book_id, chapter, text in iter_chapters():
+        if text:
+            render_chapter(book_id, chapter, text)
+            count += 1
+    return count
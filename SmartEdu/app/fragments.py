@@ -0,0 +1,92 @@
+# Template Fragment Cache
+# `{% cache "name", key, ... %}...{% endcache %}` renders its body once per key and
+# replays the HTML afterwards. Keys must name everything the body depends on (ids,
+# catalog version counters), and the template digest is folded in, so a deploy that
+# edits a template never serves the old markup.
+import hashlib
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from .http_cache import templates_version
+from .stores import TTLCache, app_singleton
+
+
+class FragmentCache(TTLCache):
+    """TTL + LRU cache of rendered template fragments, optionally shared through SQLite.
+
+    Capped by entry count and total HTML size. Hits and misses are also
+    counted per block name so the stats show which blocks earn their keep.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=8 * 1024 * 1024, ttl=3600, path=None):
+        super().__init__(maxsize, ttl, maxbytes, path, table='fragment_cache', column='html')
+        self._blocks = {}
+
+    @staticmethod
+    def key(parts):
+        raw = repr((templates_version(), [str(part) for part in parts]))
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get_block(self, name, key):
+        """Cached HTML for a block's key, or None"""
+        html, shared = self.peek(key)
+        self.count(html is not None, shared)
+        with self._lock:
+            counts = self._blocks.setdefault(name, [0, 0, 0])
+            counts[0 if html is not None else 1] += 1
+            counts[2] += shared
+        return html
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            blocks = {}
+            for name, (hits, misses, shared_hits) in sorted(self._blocks.items()):
+                lookups = hits + misses
+                blocks[name] = {'hits': hits, 'shared_hits': shared_hits, 'misses': misses,
+                                'hit_rate': round(hits / lookups, 3) if lookups else 0.0}
+        stats['blocks'] = blocks
+        return stats
+
+
+def _build(config):
+    if config['FRAGMENT_CACHE_SIZE'] <= 0:
+        return None
+    return FragmentCache(config['FRAGMENT_CACHE_SIZE'], config['FRAGMENT_CACHE_BYTES'],
+                         config['FRAGMENT_CACHE_TTL'], config['FRAGMENT_CACHE_DB'] or None)
+
+
+def get_fragment_cache():
+    """The per-process fragment cache for the current app, or None when disabled"""
+    return app_singleton('fragment_cache', _build)
+
+
+class FragmentCacheExtension(Extension):
+    """Jinja extension adding the ``{% cache %}`` tag.
+
+    The first argument names the block in the stats; the rest form its key.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render', [nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, parts, caller):
+        cache = get_fragment_cache()
+        if cache is None:
+            return caller()
+        key = cache.key(parts)
+        html = cache.get_block(parts[0], key)
+        if html is None:
+            html = str(caller())
+            cache.set(key, html)
+        return Markup(html)
@@ -0,0 +1,84 @@
+# HTTP Caching Helpers
+from functools import wraps
+import hashlib
+
+from flask import current_app, jsonify, make_response, request, session
+from flask_login import current_user
+
+
+def conditional_json(payload):
+    """JSON response with an ETag, answered with 304 Not Modified when the client's copy matches.
+
+    Catalog JSON may be reused for CATALOG_MAX_AGE seconds, after which the
+    browser revalidates with If-None-Match instead of downloading it again.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['CATALOG_MAX_AGE']
+    return response.make_conditional(request)
+
+
+def templates_version():
+    """Digest of every template's source, so a deploy that changes markup changes every page ETag"""
+    env = current_app.jinja_env
+    version = current_app.extensions.get('templates_version')
+    if version is None or env.auto_reload:
+        digest = hashlib.blake2b(digest_size=8)
+        for name in sorted(env.list_templates()):
+            digest.update(name.encode('utf-8'))
+            digest.update(env.loader.get_source(env, name)[0].encode('utf-8'))
+        version = digest.hexdigest()
+        current_app.extensions['templates_version'] = version
+    return version
+
+
+def _viewer():
+    # The navbar and greeting show who is signed in, so their page differs from anyone else's
+    if not current_user.is_authenticated:
+        return None
+    return (current_user.id, current_user.username, current_user.full_name, current_user.profile_picture)
+
+
+def page_etag(version):
+    raw = repr((templates_version(), request.full_path, _viewer(), version))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def conditional_page(version, shared=False):
+    """Decorator giving an HTML view an ETag and answering If-None-Match with 304 before it runs.
+
+    ``version(**view_args)`` must be cheap (a catalog version counter, not the
+    content) and return None when the page doesn't exist. Signed-in pages are
+    ``private, no-cache``: the browser keeps a copy and revalidates it every
+    time. With ``shared``, anonymous copies are public and a reverse proxy may
+    serve them for PAGE_SHARED_MAX_AGE seconds.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            # A pending flash message is shown once, so that page must actually render
+            if request.method not in ('GET', 'HEAD') or '_flashes' in session:
+                return view(**kwargs)
+            current = version(**kwargs)
+            if current is None:
+                return view(**kwargs)
+
+            etag = page_etag(current)
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if shared and not current_user.is_authenticated:
+                response.cache_control.public = True
+                response.cache_control.max_age = 0
+                response.cache_control.s_maxage = current_app.config['PAGE_SHARED_MAX_AGE']
+            else:
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,43 @@
+# Chat Response Cache
+import hashlib
+import re
+import unicodedata
+
+from ..stores import TTLCache, app_singleton
+
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE_END = '?.! '  # stripped from the end only; "c++", "c#" and "a != b" keep their symbols
+
+
+def normalize_prompt(text):
+    """Fold case, spacing and closing punctuation so near-identical questions share a key"""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return _WHITESPACE.sub(' ', text).strip().rstrip(_SENTENCE_END)
+
+
+class ChatCache(TTLCache):
+    """TTL + LRU cache of chatbot replies, optionally shared through SQLite.
+
+    The in-memory layer is per worker; when ``path`` is set, misses fall
+    through to a SQLite file every gunicorn worker on the host reads and
+    writes, so one student's answer serves the whole class.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, path=None):
+        super().__init__(maxsize, ttl, path=path, table='chat_cache', column='reply')
+
+    @staticmethod
+    def key(prompt, model, system_prompt):
+        raw = '\x1f'.join((model, system_prompt, normalize_prompt(prompt)))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _build(config):
+    if config['CHAT_CACHE_SIZE'] <= 0:
+        return None
+    return ChatCache(config['CHAT_CACHE_SIZE'], config['CHAT_CACHE_TTL'], config['CHAT_CACHE_DB'] or None)
+
+
+def get_cache():
+    """The per-process chat cache for the current app, or None when disabled"""
+    return app_singleton('chat_cache', _build)
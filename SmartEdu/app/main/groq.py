@@ -0,0 +1,198 @@
+# Groq Chat Client
+import asyncio
+import concurrent.futures
+import json
+import queue
+import threading
+
+import httpx
+
+from ..stores import app_singleton
+
+SYSTEM_PROMPT = (
+    "You're a bot which intuitively explains CS from 5th to 12th Grade. "
+    "You will not use emojis inappropriately and only use them in headings. "
+    "Make learning fun. You are the bot of a website called FluxTech and your job is to help students."
+)
+
+
+class ChatError(Exception):
+    """Upstream failure, carrying the reply shown to the student and the HTTP status"""
+
+    def __init__(self, reply, status=502):
+        super().__init__(reply)
+        self.reply = reply
+        self.status = status
+
+
+class ChatBusy(ChatError):
+    """Raised instead of queueing when too many chats are already waiting"""
+
+    def __init__(self):
+        super().__init__("The AI tutor is busy right now. Please try again in a moment.", 503)
+
+
+class GroqClient:
+    """OpenAI-style chat completions over one shared keep-alive connection pool.
+
+    Requests run on a dedicated asyncio loop thread, so a slow completion
+    holds a socket rather than a worker process. At most ``max_concurrency``
+    calls are in flight upstream and at most ``max_queue`` more may wait;
+    beyond that ``complete`` fails fast with ChatBusy.
+    """
+
+    def __init__(self, base_url, model, timeout=20, max_concurrency=16, max_queue=64):
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._http = None
+        self._semaphore = None
+
+    def _start(self):
+        # Called lazily so each gunicorn worker builds its own loop after fork
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._http = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.max_concurrency,
+                                        max_keepalive_connections=self.max_concurrency),
+                )
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name='groq-client', daemon=True).start()
+            ready.wait()
+            self._loop = loop
+
+    def payload(self, messages, temperature=0.7, **extra):
+        return {"model": self.model, "messages": messages, "temperature": temperature, **extra}
+
+    async def _complete(self, api_key, payload):
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        async with self._semaphore:
+            try:
+                response = await self._http.post(f"{self.base_url}/chat/completions",
+                                                  headers=headers, json=payload)
+            except httpx.HTTPError as e:
+                raise ChatError(f"Network error contacting Groq API: {e}")
+
+        if response.status_code != 200:
+            try:
+                data = response.json()
+            except ValueError:
+                data = response.text
+            raise ChatError(f"Groq API error {response.status_code}: {data}")
+
+        data = response.json()
+        if "choices" not in data or not data["choices"]:
+            raise ChatError(f"Unexpected Groq response: {data}")
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream(self, api_key, payload, chunks):
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        try:
+            async with self._semaphore:
+                try:
+                    async with self._http.stream("POST", f"{self.base_url}/chat/completions",
+                                                 headers=headers, json=payload) as response:
+                        if response.status_code != 200:
+                            body = (await response.aread()).decode('utf-8', 'replace')
+                            try:
+                                data = json.loads(body)
+                            except ValueError:
+                                data = body
+                            raise ChatError(f"Groq API error {response.status_code}: {data}")
+
+                        # OpenAI-style SSE: "data: {json}" lines, terminated by "data: [DONE]"
+                        async for line in response.aiter_lines():
+                            if not line.startswith('data:'):
+                                continue
+                            data = line[5:].strip()
+                            if data == '[DONE]':
+                                break
+                            try:
+                                choices = json.loads(data).get('choices') or [{}]
+                            except ValueError:
+                                continue
+                            delta = choices[0].get('delta', {}).get('content')
+                            if delta:
+                                chunks.put(delta)
+                except httpx.HTTPError as e:
+                    raise ChatError(f"Network error contacting Groq API: {e}")
+        except ChatError as e:
+            chunks.put(e)
+        finally:
+            chunks.put(None)
+
+    def _submit(self, coro):
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                coro.close()
+                raise ChatBusy()
+            self._pending += 1
+        self._start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def complete(self, api_key, messages, temperature=0.7):
+        """Blocking call returning the assistant reply text"""
+        future = self._submit(self._complete(api_key, self.payload(messages, temperature)))
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise ChatError("Network error contacting Groq API: timed out")
+
+    def stream(self, api_key, messages, temperature=0.7):
+        """Generator of reply text fragments as the upstream API produces them.
+
+        Raises ChatError from the generator if the call fails; closing the
+        generator early cancels the upstream request.
+        """
+        chunks = queue.Queue()
+        payload = self.payload(messages, temperature, stream=True)
+        future = self._submit(self._stream(api_key, payload, chunks))
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise ChatError("Network error contacting Groq API: timed out")
+                if chunk is None:
+                    return
+                if isinstance(chunk, ChatError):
+                    raise chunk
+                yield chunk
+        finally:
+            future.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {'pending': self._pending, 'max_concurrency': self.max_concurrency,
+                    'max_queue': self.max_queue}
+
+
+def get_client():
+    """The per-process Groq client for the current app"""
+    return app_singleton('groq_client', lambda config: GroqClient(
+        config['GROQ_API_URL'], config['GROQ_MODEL'],
+        timeout=config['GROQ_TIMEOUT'],
+        max_concurrency=config['GROQ_MAX_CONCURRENCY'],
+        max_queue=config['GROQ_MAX_QUEUE']))
@@ -0,0 +1,162 @@
+# Chat Rate Limiting
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+from ..stores import SqliteFile, app_singleton
+from .groq import ChatError
+
+
+class RateLimited(ChatError):
+    """Rejected before any work is done; carries the Retry-After hint in seconds"""
+
+    def __init__(self, reply, retry_after=1):
+        super().__init__(reply, 429)
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class ChatLimiter:
+    """Token bucket per user/IP plus a cap on upstream chats in flight.
+
+    Each key refills ``rate`` tokens per second up to ``burst``; a chat
+    costs one token. ``max_inflight`` bounds concurrent upstream calls.
+    With ``path`` set, both live in a SQLite file so the limits hold
+    across every gunicorn worker on the host; otherwise they are per
+    worker. Over-limit requests fail immediately instead of queueing.
+    """
+
+    PRUNE_EVERY = 1000  # checks between sweeps of idle buckets
+
+    def __init__(self, rate=0.5, burst=10, max_inflight=32, path=None, timeout=20):
+        self.rate = rate
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self.path = path
+        self.timeout = timeout
+        self.allowed = 0
+        self.limited = 0
+        self.busy = 0
+        self._buckets = {}
+        self._inflight = 0
+        self._checks = 0
+        self._lock = threading.Lock()
+        self.db = None
+        if path:
+            self.db = SqliteFile(path, ('''CREATE TABLE IF NOT EXISTS chat_bucket (
+                                               key TEXT PRIMARY KEY,
+                                               tokens REAL NOT NULL,
+                                               updated_at REAL NOT NULL)''',
+                                        '''CREATE TABLE IF NOT EXISTS chat_slot (
+                                               id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                               owner INTEGER NOT NULL,
+                                               started_at REAL NOT NULL)'''))
+
+    def _refill(self, tokens, updated_at, now):
+        return min(self.burst, tokens + (now - updated_at) * self.rate)
+
+    def _take(self, key, now):
+        """Spend one token for a key; returns seconds until one is available (0 if spent)"""
+        if self.path:
+            with self.db.transaction() as conn:
+                row = conn.execute('SELECT tokens, updated_at FROM chat_bucket WHERE key = ?', (key,)).fetchone()
+                tokens = self._refill(*row, now) if row else self.burst
+                wait = 0 if tokens >= 1 else (1 - tokens) / self.rate
+                conn.execute('INSERT OR REPLACE INTO chat_bucket (key, tokens, updated_at) VALUES (?, ?, ?)',
+                             (key, tokens - 1 if not wait else tokens, now))
+            return wait
+
+        with self._lock:
+            entry = self._buckets.get(key)
+            tokens = self._refill(*entry, now) if entry else self.burst
+            wait = 0 if tokens >= 1 else (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1 if not wait else tokens, now)
+            return wait
+
+    def _prune(self, now):
+        # A bucket idle long enough to refill completely carries no state worth keeping
+        idle = now - self.burst / self.rate
+        if self.path:
+            self.db.execute('DELETE FROM chat_bucket WHERE updated_at < ?', (idle,))
+        with self._lock:
+            for key in [k for k, (_, updated_at) in self._buckets.items() if updated_at < idle]:
+                del self._buckets[key]
+
+    def check(self, key):
+        """Charge one chat to a key, raising RateLimited when its bucket is empty"""
+        if self.rate <= 0:
+            return
+        now = time.time()
+        wait = self._take(key, now)
+        with self._lock:
+            self._checks += 1
+            prune = self._checks % self.PRUNE_EVERY == 0
+            if wait:
+                self.limited += 1
+            else:
+                self.allowed += 1
+        if prune:
+            self._prune(now)
+        if wait:
+            raise RateLimited("You're sending messages too quickly. Please wait a moment and try again.", wait)
+
+    def _acquire(self):
+        if self.path:
+            now = time.time()
+            with self.db.transaction() as conn:
+                # Slots older than the upstream timeout belong to a worker that died mid-call
+                conn.execute('DELETE FROM chat_slot WHERE started_at < ?', (now - self.timeout,))
+                (count,) = conn.execute('SELECT COUNT(*) FROM chat_slot').fetchone()
+                if count >= self.max_inflight:
+                    return None
+                return conn.execute('INSERT INTO chat_slot (owner, started_at) VALUES (?, ?)',
+                                    (os.getpid(), now)).lastrowid
+
+        with self._lock:
+            if self._inflight >= self.max_inflight:
+                return None
+            self._inflight += 1
+            return True
+
+    def _release(self, slot):
+        if self.path:
+            self.db.execute('DELETE FROM chat_slot WHERE id = ?', (slot,))
+            return
+        with self._lock:
+            self._inflight -= 1
+
+    @contextmanager
+    def slot(self):
+        """Hold one upstream slot for the duration of a call, or raise RateLimited"""
+        if self.max_inflight <= 0:
+            yield
+            return
+        slot = self._acquire()
+        if slot is None:
+            with self._lock:
+                self.busy += 1
+            raise RateLimited("The AI tutor is busy right now. Please try again in a moment.")
+        try:
+            yield
+        finally:
+            self._release(slot)
+
+    def stats(self):
+        if self.path:
+            (inflight,) = self.db.execute('SELECT COUNT(*) FROM chat_slot').fetchone()
+        else:
+            inflight = self._inflight
+        with self._lock:
+            return {'rate': self.rate, 'burst': self.burst, 'max_inflight': self.max_inflight,
+                    'shared': bool(self.path), 'in_flight': inflight, 'allowed': self.allowed,
+                    'limited': self.limited, 'busy': self.busy}
+
+
+def _build(config):
+    return ChatLimiter(config['CHAT_RATE'], config['CHAT_BURST'], config['CHAT_MAX_INFLIGHT'],
+                       config['RATELIMIT_DB'] or None, config['GROQ_TIMEOUT'])
+
+
+def get_limiter():
+    """The per-process chat limiter for the current app"""
+    return app_singleton('chat_limiter', _build)
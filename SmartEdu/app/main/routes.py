@@ -1,8 +1,15 @@
 # Main Routes
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, Response, render_template, request, jsonify, current_app
 from flask_login import login_required, current_user
+import json
 import os
-import requests
+from .chat_cache import ChatCache, get_cache
+from .groq import SYSTEM_PROMPT, ChatError, get_client
+from .ratelimit import get_limiter
+from .singleflight import get_flights
+from ..auth.identity import get_user_cache
+from ..elibrary.render import chapter_cache
+from ..fragments import get_fragment_cache
 
 main = Blueprint('main', __name__)
 
@@ -21,59 +28,117 @@ def explore():
 
 @main.route('/chat', methods=['POST'])
 def chat():
+    # Throttle per student (or per IP when signed out) before doing any work
+    limiter = get_limiter()
+    client_key = f"user:{current_user.id}" if current_user.is_authenticated else f"ip:{request.remote_addr}"
+    try:
+        limiter.check(client_key)
+    except ChatError as e:
+        return chat_error(e)
+
     user_message = request.json.get('message', '')
     groq_api_key = os.getenv('GROQ_API_KEY')
     if not groq_api_key:
         return jsonify({"reply": "Server configuration error: GROQ_API_KEY not set"}), 500
 
-    headers = {
-        "Authorization": f"Bearer {groq_api_key}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": "openai/gpt-oss-120b",
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You're a bot which intuitively explains CS from 5th to 12th Grade. "
-                    "You will not use emojis inappropriately and only use them in headings. "
-                    "Make learning fun. You are the bot of a website called FluxTech and your job is to help students."
-                )
-            },
-            {
-                "role": "user",
-                "content": user_message
-            }
-        ],
-        "temperature": 0.7
-    }
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_message}
+    ]
 
-    try:
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=20
-        )
-    except requests.RequestException as e:
-        return jsonify({"reply": f"Network error contacting Groq API: {e}"}), 502
-
-    if response.status_code != 200:
-        try:
-            data = response.json()
-        except ValueError:
-            data = response.text
-        return jsonify({"reply": f"Groq API error {response.status_code}: {data}"}), 502
+    # Near-identical questions from a class share one upstream answer
+    cache = get_cache()
+    cache_key = ChatCache.key(user_message, get_client().model, SYSTEM_PROMPT)
+    cached_reply = cache.get(cache_key) if cache else None
+
+    if request.json.get('stream'):
+        return stream_chat(groq_api_key, messages, cache_key, cached_reply)
+
+    if cached_reply is not None:
+        return jsonify({"reply": cached_reply})
 
-    data = response.json()
-    if "choices" not in data or not data["choices"]:
-        return jsonify({"reply": f"Unexpected Groq response: {data}"}), 502
+    def ask():
+        with limiter.slot():
+            return get_client().complete(groq_api_key, messages, temperature=0.7)
+
+    # Identical questions already in flight wait for that answer instead of calling upstream again
+    try:
+        ai_reply = get_flights().do(cache_key, ask, cache)
+    except ChatError as e:
+        return chat_error(e)
 
-    ai_reply = data["choices"][0]["message"]["content"]
     return jsonify({"reply": ai_reply})
 
+@main.route('/chat/stats')
+@login_required
+def chat_stats():
+    cache = get_cache()
+    return jsonify({
+        "cache": cache.stats() if cache else None,
+        "client": get_client().stats(),
+        "flights": get_flights().stats(),
+        "limits": get_limiter().stats()
+    })
+
+@main.route('/cache/stats')
+@login_required
+def cache_stats():
+    """Per-worker page caches, including per-block hit rates for {% cache %} fragments"""
+    fragments = get_fragment_cache()
+    return jsonify({
+        "fragments": fragments.stats() if fragments else None,
+        "chapters": chapter_cache.stats(),
+        "users": get_user_cache().stats()
+    })
+
+def chat_error(e):
+    """JSON response for a failed chat, with Retry-After when the client should back off"""
+    response = jsonify({"reply": e.reply})
+    response.status_code = e.status
+    retry_after = getattr(e, 'retry_after', None)
+    if retry_after:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def sse(data, event=None):
+    """Format one Server-Sent Event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+def stream_chat(groq_api_key, messages, cache_key=None, cached_reply=None):
+    """Forward reply fragments to the browser as Server-Sent Events"""
+    if cached_reply is not None:
+        return Response([sse({"delta": cached_reply}), sse({}, event="done")],
+                        mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+    limiter = get_limiter()
+
+    def ask():
+        with limiter.slot():
+            yield from get_client().stream(groq_api_key, messages, temperature=0.7)
+
+    chunks = get_flights().stream(cache_key, ask, get_cache())
+    # Wait for the first fragment so upstream failures still get a JSON error status
+    try:
+        first = next(chunks, None)
+    except ChatError as e:
+        return chat_error(e)
+
+    def events():
+        try:
+            if first is not None:
+                yield sse({"delta": first})
+            for chunk in chunks:
+                yield sse({"delta": chunk})
+            yield sse({}, event="done")
+        except ChatError as e:
+            yield sse({"reply": e.reply}, event="error")
+        finally:
+            chunks.close()
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @main.route('/ai')
 @login_required
 def ai():
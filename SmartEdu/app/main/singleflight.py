@@ -0,0 +1,189 @@
+# Single-Flight Request Coalescing
+import os
+import threading
+import time
+
+from ..stores import SqliteFile, app_singleton
+from .groq import ChatError
+
+
+class Flight:
+    """One in-progress upstream call whose output several requests wait on"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def publish(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def follow(self, timeout):
+        """Yield the leader's chunks as they arrive, re-raising its error"""
+        index = 0
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while index == len(self.chunks) and not self.done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ChatError("Network error contacting Groq API: timed out")
+                    self._cond.wait(remaining)
+                pending = self.chunks[index:]
+                index = len(self.chunks)
+                finished, error = self.done, self.error
+            yield from pending
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+    def result(self, timeout):
+        return ''.join(self.follow(timeout))
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one.
+
+    Within a worker, requests for a key already in flight follow the
+    leader's Flight. With ``path`` set, leaders also claim the key in a
+    SQLite lock table, so a second worker waits for the first one's
+    answer to appear in the shared chat cache instead of calling
+    upstream again.
+    """
+
+    def __init__(self, timeout=20, path=None, poll_interval=0.05):
+        self.timeout = timeout
+        self.path = path
+        self.poll_interval = poll_interval
+        self.leaders = 0
+        self.followers = 0
+        self.remote_followers = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.db = None
+        if path:
+            self.db = SqliteFile(path, ('''CREATE TABLE IF NOT EXISTS chat_inflight (
+                                               key TEXT PRIMARY KEY,
+                                               owner INTEGER NOT NULL,
+                                               started_at REAL NOT NULL)''',))
+
+    def _claim(self, key):
+        """Take the cross-worker lock for a key; False if another worker holds it"""
+        now = time.time()
+        # Locks older than the upstream timeout belong to a worker that died mid-call
+        self.db.execute('DELETE FROM chat_inflight WHERE key = ? AND started_at < ?', (key, now - self.timeout))
+        cursor = self.db.execute('INSERT OR IGNORE INTO chat_inflight (key, owner, started_at) VALUES (?, ?, ?)',
+                               (key, os.getpid(), now))
+        return cursor.rowcount == 1
+
+    def _release(self, key):
+        self.db.execute('DELETE FROM chat_inflight WHERE key = ? AND owner = ?', (key, os.getpid()))
+
+    def _wait_remote(self, key, cache):
+        """Poll for another worker's answer; None if its lock went away without one.
+
+        Polls with ``cache.peek`` so the wait counts as one cache lookup,
+        not one miss per poll.
+        """
+        reply, shared = None, False
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            reply, shared = cache.peek(key)
+            if reply is not None:
+                break
+            held = self.db.execute('SELECT 1 FROM chat_inflight WHERE key = ?', (key,)).fetchone()
+            if not held:
+                reply, shared = cache.peek(key)
+                break
+        cache.count(reply is not None, shared)
+        return reply
+
+    def begin(self, key):
+        """Return (flight, is_leader) for a key"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.followers += 1
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def end(self, key, flight, error=None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.finish(error)
+
+    def stream(self, key, start, cache=None):
+        """Yield reply chunks for a key, running ``start()`` (a chunk iterator) only once.
+
+        The finished reply is stored in ``cache`` before the cross-worker
+        lock is released, so waiting workers find it there.
+        """
+        flight, leader = self.begin(key)
+        if not leader:
+            yield from flight.follow(self.timeout)
+            return
+
+        shared = bool(self.path and cache is not None)
+        claimed = False
+        try:
+            if shared:
+                claimed = self._claim(key)
+                if not claimed:
+                    reply = self._wait_remote(key, cache)
+                    if reply is not None:
+                        with self._lock:
+                            self.remote_followers += 1
+                        flight.publish(reply)
+                        yield reply
+                        self.end(key, flight)
+                        return
+                    claimed = self._claim(key)
+            for chunk in start():
+                flight.publish(chunk)
+                yield chunk
+            if cache is not None and flight.chunks:
+                cache.set(key, ''.join(flight.chunks))
+        except ChatError as e:
+            self.end(key, flight, e)
+            raise
+        except GeneratorExit:
+            # The leader's client went away mid-reply; don't hand followers a truncated answer
+            self.end(key, flight, ChatError("The reply was interrupted. Please ask again."))
+            raise
+        except Exception:
+            self.end(key, flight, ChatError("Unexpected error contacting Groq API"))
+            raise
+        finally:
+            if claimed:
+                self._release(key)
+        self.end(key, flight)
+
+    def do(self, key, fn, cache=None):
+        """Return fn() for a key, sharing one call among concurrent callers"""
+        return ''.join(self.stream(key, lambda: iter([fn()]), cache))
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._flights), 'leaders': self.leaders,
+                    'followers': self.followers, 'remote_followers': self.remote_followers}
+
+
+def get_flights():
+    """The per-process single-flight table for the current app"""
+    return app_singleton('chat_flights', lambda config: SingleFlight(timeout=config['GROQ_TIMEOUT'],
+                                                                     path=config['CHAT_CACHE_DB'] or None))
@@ -1,11 +1,25 @@
 # Database Models
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from contextlib import contextmanager
 from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import validates
+import unicodedata
+from .auth.passwords import get_hasher, hash_password, verify_password
+
+try:
+    import fcntl
+except ImportError:  # Windows: gunicorn doesn't run there, so only one process migrates
+    fcntl = None
 
 db = SQLAlchemy()
 
+
+def account_key(value):
+    """Case-folded form of a username or email, so Élodie and élodie are one account"""
+    return unicodedata.normalize('NFKC', value.strip()).casefold()
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -16,15 +30,29 @@ class User(UserMixin, db.Model):
     learning_goal = db.Column(db.String(255))  # User's learning goal
     heard_from = db.Column(db.String(255))  # Where they heard about SmartEdu
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Login and signup match on these (see account_key); SQLite's lower() only folds ASCII
+    username_key = db.Column(db.String(80))
+    email_key = db.Column(db.String(120))
+    __table_args__ = (db.Index('ix_user_username_key', 'username_key', unique=True),
+                      db.Index('ix_user_email_key', 'email_key', unique=True))
+
+    @validates('username', 'email')
+    def _set_key(self, field, value):
+        setattr(self, f'{field}_key', account_key(value) if value is not None else None)
+        return value
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return get_hasher().needs_rehash(self.password_hash)
 
 class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(100), unique=True, index=True)  # URL id, e.g. 'python-basics'
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     instructor = db.Column(db.String(120))
@@ -33,10 +61,17 @@ class Course(db.Model):
     students = db.Column(db.Integer, default=0)
     rating = db.Column(db.Float, default=4.5)
     price = db.Column(db.Float, default=0)
+    category = db.Column(db.String(50))  # Catalog tab, e.g. 'programming'
+    emoji = db.Column(db.String(16))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped by triggers on every course change (migration 0007)
+    # Catalog pages filter on level or category and page by id
+    __table_args__ = (db.Index('ix_course_level_id', 'level', 'id'),
+                      db.Index('ix_course_category_id', 'category', 'id'))
 
 class Book(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(100), unique=True, index=True)  # URL id, e.g. 'clean-code'
     title = db.Column(db.String(200), nullable=False)
     author = db.Column(db.String(120))
     description = db.Column(db.Text)
@@ -46,10 +81,22 @@ class Book(db.Model):
     published_date = db.Column(db.DateTime)
     rating = db.Column(db.Float, default=4.5)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped by triggers on every book or chapter change (migration 0007)
+    __table_args__ = (db.Index('ix_book_category_id', 'category', 'id'),)
+
+class Chapter(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    book_id = db.Column(db.Integer, db.ForeignKey('book.id'), nullable=False)
+    number = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text)  # Markdown source
+    # The reader's table of contents is answered from this index alone, never touching chapter text
+    __table_args__ = (db.UniqueConstraint('book_id', 'number'),
+                      db.Index('ix_chapter_toc', 'book_id', 'number', 'title'))
 
 class Module(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    course_id = db.Column(db.String(100), nullable=False)
+    course_id = db.Column(db.String(100), nullable=False)  # Course slug, or '*' for modules shared by every course
     module_id = db.Column(db.String(100), nullable=False)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -60,6 +107,10 @@ class Module(db.Model):
     resources = db.Column(db.Text)  # JSON list of downloadable resources
     order = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped by triggers on every module or quiz change (migration 0007)
+    # Module lookup is by (course, module slug); listings walk a course in order
+    __table_args__ = (db.Index('ix_module_course_module', 'course_id', 'module_id', unique=True),
+                      db.Index('ix_module_course_order', 'course_id', 'order'))
 
 class Quiz(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -73,6 +124,14 @@ class Quiz(db.Model):
     explanation = db.Column(db.Text)
     order = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('ix_quiz_module_order', 'module_id', 'order'),)
+
+class Enrollment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    course_id = db.Column(db.String(100), nullable=False)  # Course slug, like Module.course_id
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('user_id', 'course_id'),)
 
 class UserProgress(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -82,7 +141,47 @@ class UserProgress(db.Model):
     quiz_score = db.Column(db.Integer)  # Percentage score
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # One row per student and module; writes are upserts on this index
+    __table_args__ = (db.Index('ix_user_progress_user_module', 'user_id', 'module_id', unique=True),)
+
+def configure_sqlite(app):
+    """Apply the SQLITE_* pragmas from the config to every new pooled connection"""
+    config = app.config
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}")
+        cursor.execute(f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+        cursor.execute(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+        cursor.execute(f"PRAGMA cache_size = {-int(config['SQLITE_CACHE_SIZE'])}")  # negative means KiB
+        cursor.execute(f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.close()
 
-def init_db(app):
     with app.app_context():
-        db.create_all()
+        event.listen(db.engine, 'connect', set_pragmas)
+
+@contextmanager
+def _schema_lock(path):
+    """Serialize schema upgrades between gunicorn workers booting at the same time"""
+    if fcntl is None or not path or path == ':memory:':
+        yield
+        return
+    # A sidecar file, never the database: closing any fd on the database drops SQLite's own
+    # POSIX locks on it, and another process may then checkpoint and delete the WAL under us
+    with open(path + '.migrate.lock', 'ab') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def init_db(app):
+    """Create the schema, or upgrade it to the latest migration in migrations/"""
+    from flask_migrate import stamp, upgrade
+    with app.app_context(), _schema_lock(db.engine.url.database):
+        tables = inspect(db.engine).get_table_names()
+        if tables and 'alembic_version' not in tables:
+            # Built by db.create_all() before migrations existed; 0001 is the schema it started from
+            stamp(revision='0001')
+        upgrade()
@@ -0,0 +1,185 @@
+# Catalog Search Index
+# An in-memory inverted index over the course and book catalog. Terms are kept in
+# a sorted list so a prefix ("pyth", "calc") is a bisect plus a short scan, and
+# documents are re-indexed one at a time when their catalog row changes.
+from bisect import bisect_left, insort
+import re
+import threading
+import time
+
+from sqlalchemy import event
+
+from .catalog import course_card, book_card
+from .models import Course, Book
+from .stores import app_singleton
+
+_TOKEN = re.compile(r"[\w+#]+")  # keeps "c++" and "c#" searchable
+PREFIX_WEIGHT = 0.5  # a prefix hit counts half as much as a whole-word hit
+
+# Bumped whenever this process writes a course or book, so its indexes resync on the next search
+_generation = {Course: 0, Book: 0}
+
+
+def tokenize(text):
+    return _TOKEN.findall((text or '').casefold())
+
+
+def _catalog_changed(mapper, connection, target):
+    _generation[type(target)] += 1
+
+
+for _model in (Course, Book):
+    for _name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _name, _catalog_changed)
+
+
+class SearchIndex:
+    """Inverted index mapping terms to {doc key: field weight}.
+
+    ``fields`` maps document fields to weights, so a title hit ranks above
+    an instructor or category hit. Every query term must match a whole
+    word or a word prefix; documents rank by their summed best weights.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._docs = {}
+        self._order = {}
+        self._postings = {}
+        self._terms = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _terms_for(self, doc):
+        weights = {}
+        for field, weight in self.fields.items():
+            for term in tokenize(doc.get(field)):
+                weights[term] = max(weights.get(term, 0), weight)
+        return weights
+
+    def remove(self, key):
+        with self._lock:
+            doc = self._docs.pop(key, None)
+            if doc is None:
+                return
+            del self._order[key]
+            for term in self._terms_for(doc):
+                postings = self._postings[term]
+                del postings[key]
+                if not postings:
+                    del self._postings[term]
+                    del self._terms[bisect_left(self._terms, term)]
+
+    def update(self, key, doc, order=0):
+        """Index a document, replacing any earlier version under the same key"""
+        with self._lock:
+            self.remove(key)
+            self._docs[key] = doc
+            self._order[key] = order
+            for term, weight in self._terms_for(doc).items():
+                if term not in self._postings:
+                    self._postings[term] = {}
+                    insort(self._terms, term)
+                self._postings[term][key] = weight
+
+    def sync(self, rows):
+        """Bring the index in line with (key, doc) rows; returns how many documents changed"""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for order, (key, doc) in enumerate(rows):
+                seen.add(key)
+                if self._docs.get(key) != doc or self._order.get(key) != order:
+                    self.update(key, doc, order)
+                    changed += 1
+            for key in [key for key in self._docs if key not in seen]:
+                self.remove(key)
+                changed += 1
+        return changed
+
+    def _match(self, term):
+        """Best weight per document for one query term, counting word prefixes"""
+        scores = {}
+        start = bisect_left(self._terms, term)
+        for candidate in self._terms[start:]:
+            if not candidate.startswith(term):
+                break
+            factor = 1.0 if candidate == term else PREFIX_WEIGHT
+            for key, weight in self._postings[candidate].items():
+                scores[key] = max(scores.get(key, 0), weight * factor)
+        return scores
+
+    def search(self, query='', limit=20, offset=0, **filters):
+        """Return (total matches, ``limit`` documents from ``offset`` in rank order).
+
+        Filters compare exact field values, ignoring case.
+        """
+        filters = {field: value.casefold() for field, value in filters.items() if value}
+        with self._lock:
+            terms = tokenize(query)
+            if terms:
+                scores = self._match(terms[0])
+                for term in terms[1:]:
+                    matches = self._match(term)
+                    scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+            else:
+                scores = dict.fromkeys(self._docs, 0)
+
+            hits = [key for key in scores
+                    if all((self._docs[key].get(field) or '').casefold() == value
+                           for field, value in filters.items())]
+            hits.sort(key=lambda key: (-scores[key], self._order[key]))
+            return len(hits), [self._docs[key] for key in hits[offset:offset + limit]]
+
+
+class CatalogSearch:
+    """A SearchIndex kept in step with one catalog table.
+
+    Writes made in this process resync the index on the next search; edits
+    made elsewhere (another worker, ``flask load-catalog``) are picked up
+    within ``refresh_interval`` seconds. A resync re-indexes only the rows
+    whose card changed.
+    """
+
+    def __init__(self, model, card, fields, refresh_interval=30):
+        self.model = model
+        self.card = card
+        self.index = SearchIndex(fields)
+        self.refresh_interval = refresh_interval
+        self._generation = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        stale = (force or self._generation != _generation[self.model]
+                 or now - self._checked_at >= self.refresh_interval)
+        if not stale:
+            return 0
+        with self._lock:
+            self._generation = _generation[self.model]
+            self._checked_at = now
+            rows = self.model.query.filter(self.model.slug.isnot(None)).order_by(self.model.id)
+            return self.index.sync((row.slug, self.card(row)) for row in rows)
+
+    def search(self, query='', limit=20, offset=0, **filters):
+        self.refresh()
+        return self.index.search(query, limit, offset, **filters)
+
+
+def _get_search(name, model, card, fields):
+    return app_singleton(name, lambda config: CatalogSearch(model, card, fields, config['SEARCH_REFRESH_INTERVAL']))
+
+
+def course_search():
+    """The per-process course search index for the current app"""
+    return _get_search('course_search', Course, course_card,
+                       {'name': 3, 'instructor': 2, 'category': 1.5, 'level': 1})
+
+
+def book_search():
+    """The per-process book search index for the current app"""
+    return _get_search('book_search', Book, book_card,
+                       {'title': 3, 'author': 2, 'category': 1.5})
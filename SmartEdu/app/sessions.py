@@ -0,0 +1,236 @@
+# Server-Side Sessions
+# The session cookie carries only an opaque random id; the data lives in a SQLite
+# table every worker shares. A request that never touches `session` never reads
+# or writes the store, and expired rows are swept by a background thread.
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+
+from flask import session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from flask_login import user_logged_in, user_logged_out
+from werkzeug.datastructures import CallbackDict
+
+from .stores import SqliteFile
+
+COMPRESS_MIN = 256  # payloads at least this long are stored zlib-compressed
+_serializer = TaggedJSONSerializer()  # the tuples, bytes and Markup Flask keeps in sessions survive a round trip
+
+
+def dumps(data):
+    """Compact bytes for a session dict: a one-byte codec flag, then tagged JSON"""
+    raw = _serializer.dumps(dict(data)).encode('utf-8')
+    if len(raw) >= COMPRESS_MIN:
+        return b'z' + zlib.compress(raw)
+    return b'j' + raw
+
+
+def loads(blob):
+    blob = bytes(blob)
+    raw = zlib.decompress(blob[1:]) if blob[:1] == b'z' else blob[1:]
+    return _serializer.loads(raw.decode('utf-8'))
+
+
+class SessionStore:
+    """SQLite table of session id -> serialized data and expiry time"""
+
+    def __init__(self, path, sweep_interval=300):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self.reads = 0
+        self.writes = 0
+        self.swept = 0
+        self._sweeper = None
+        # Created on first use rather than in create_app, which does no DDL in production
+        self.db = SqliteFile(path, ('''CREATE TABLE IF NOT EXISTS session (
+                                           id TEXT PRIMARY KEY,
+                                           data BLOB NOT NULL,
+                                           expires_at REAL NOT NULL)''',
+                                    'CREATE INDEX IF NOT EXISTS ix_session_expires_at ON session (expires_at)'))
+
+    def get(self, sid):
+        """(data, expires_at) for a live session id, or None"""
+        self.reads += 1
+        row = self.db.execute('SELECT data, expires_at FROM session WHERE id = ? AND expires_at > ?',
+                            (sid, time.time())).fetchone()
+        return (loads(row[0]), row[1]) if row else None
+
+    def set(self, sid, data, expires_at):
+        self.writes += 1
+        self.db.execute('INSERT OR REPLACE INTO session (id, data, expires_at) VALUES (?, ?, ?)',
+                      (sid, dumps(data), expires_at))
+
+    def touch(self, sid, expires_at):
+        self.writes += 1
+        self.db.execute('UPDATE session SET expires_at = ? WHERE id = ?', (expires_at, sid))
+
+    def delete(self, sid):
+        self.db.execute('DELETE FROM session WHERE id = ?', (sid,))
+
+    def sweep(self):
+        count = self.db.execute('DELETE FROM session WHERE expires_at <= ?', (time.time(),)).rowcount
+        self.swept += count
+        return count
+
+    def start_sweeper(self):
+        # One daemon thread per process, started after fork by the first request
+        if self._sweeper is not None and self._sweeper[0] == os.getpid():
+            return
+
+        def run():
+            while True:
+                time.sleep(self.sweep_interval)
+                try:
+                    self.sweep()
+                except sqlite3.Error:
+                    pass  # busy; the next sweep catches up
+
+        thread = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        self._sweeper = (os.getpid(), thread)
+        thread.start()
+
+    def stats(self):
+        (size,) = self.db.execute('SELECT COUNT(*) FROM session').fetchone()
+        return {'size': size, 'reads': self.reads, 'writes': self.writes, 'swept': self.swept}
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session dict that reads its data from the store the first time it is used"""
+
+    def __init__(self, load, cookie=None):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(None, on_update)
+        self.cookie = cookie
+        self.sid = None
+        self.expires_at = None
+        self.loaded = False
+        self.modified = False
+        self.regenerate = False
+        self._loader = load
+
+    def __contains__(self, key):
+        # Flask-Login probes "_remember" after every request; it is set and popped within
+        # one request and never stored, so answering that probe needs no read
+        if key == '_remember' and not self.loaded:
+            return False
+        self.load()
+        return dict.__contains__(self, key)
+
+    def load(self):
+        if not self.loaded:
+            self.loaded = True
+            self.accessed = True
+            data = self._loader(self)
+            if data:
+                dict.update(self, data)
+
+
+def _loading(name):
+    method = getattr(CallbackDict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('__getitem__', '__iter__', '__len__', '__repr__', '__eq__',
+              'get', 'keys', 'values', 'items', 'copy',
+              '__setitem__', '__delitem__', 'setdefault', 'pop', 'popitem', 'update', 'clear'):
+    setattr(ServerSession, _name, _loading(_name))
+
+
+class SqliteSessionInterface(SessionInterface):
+    """Flask session interface backed by a SessionStore.
+
+    Sessions expire PERMANENT_SESSION_LIFETIME after their last write; an
+    unmodified session's expiry is pushed back at most once per
+    ``refresh_interval`` seconds so reads don't turn into writes. A cookie
+    from before server-side sessions is imported once so nobody is logged
+    out by the switch.
+    """
+
+    def __init__(self, store, refresh_interval=300):
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self._legacy = SecureCookieSessionInterface()
+
+    def open_session(self, app, request):
+        self.store.start_sweeper()
+        cookie = request.cookies.get(self.get_cookie_name(app))
+
+        def load(session):
+            if not cookie:
+                return None
+            found = self.store.get(cookie)
+            if found is not None:
+                session.sid = cookie
+                data, session.expires_at = found
+                return data
+            return self._import_cookie(app, cookie, session)
+
+        return ServerSession(load, cookie)
+
+    def _import_cookie(self, app, cookie, session):
+        serializer = self._legacy.get_signing_serializer(app)
+        try:
+            data = serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds()))
+        except Exception:
+            return None  # unknown or expired id; start a fresh session
+        session.modified = True
+        return data
+
+    def save_session(self, app, session, response):
+        if not session.loaded:
+            return  # the view never touched the session: no read, no write, no cookie
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        response.vary.add('Cookie')
+
+        if not session:
+            if session.sid:
+                self.store.delete(session.sid)
+            if session.cookie:
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        if session.regenerate and session.sid:
+            self.store.delete(session.sid)
+            session.sid = None
+        if session.sid is None or session.modified:
+            session.sid = session.sid or secrets.token_urlsafe(32)
+            self.store.set(session.sid, session, now + lifetime)
+        elif session.expires_at - now < lifetime - self.refresh_interval:
+            self.store.touch(session.sid, now + lifetime)
+        else:
+            return  # fresh enough; the browser already has this cookie
+
+        response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app), domain=domain, path=path,
+                            secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app))
+
+
+def _rotate(sender, **extra):
+    # A new id on login and logout, so a session id planted before login is worthless after it
+    if isinstance(session._get_current_object(), ServerSession):
+        session.regenerate = True
+
+
+def init_sessions(app):
+    """Switch the app to server-side sessions in SESSION_DB"""
+    store = SessionStore(app.config['SESSION_DB'], app.config['SESSION_SWEEP_INTERVAL'])
+    app.session_interface = SqliteSessionInterface(store, app.config['SESSION_REFRESH_INTERVAL'])
+    app.extensions['session_store'] = store
+    user_logged_in.connect(_rotate, app)
+    user_logged_out.connect(_rotate, app)
@@ -123,6 +123,11 @@ const throttle = (func, limit = 300) => {
   };
 };
 
+// Escape database text for use inside HTML built with template literals (text or quoted attributes)
+const escapeHtml = (value) => String(value ?? '').replace(/[&<>"']/g, ch => ({
+  '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#039;'
+})[ch]);
+
 const animate = (element, animationClass) => {
   element.classList.add(animationClass);
   element.addEventListener('animationend', () => {
@@ -501,6 +506,114 @@ document.addEventListener('DOMContentLoaded', () => {
   initializeChatWidget();
 });
 
+/* ============================================================================
+   Chat Streaming
+   ============================================================================ */
+
+// POST a chat message and render the reply as Server-Sent Events arrive.
+// onDelta(fragment, replySoFar) runs for every fragment; resolves to the full reply.
+// Errors returned before streaming starts come back as plain JSON.
+const streamChat = async (message, onDelta) => {
+  const response = await fetch('/chat', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+    body: JSON.stringify({ message, stream: true })
+  });
+
+  const contentType = response.headers.get('Content-Type') || '';
+  if (!contentType.includes('text/event-stream')) {
+    const data = await response.json();
+    const reply = data.reply || 'No response received';
+    onDelta(reply, reply);
+    return reply;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let reply = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      const payload = data ? JSON.parse(data) : {};
+
+      if (event === 'done') return reply;
+      if (event === 'error') {
+        reply += (reply ? '\n\n' : '') + payload.reply;
+        onDelta(payload.reply, reply);
+      } else if (payload.delta) {
+        reply += payload.delta;
+        onDelta(payload.delta, reply);
+      }
+    }
+  }
+  return reply;
+};
+
+/* ============================================================================
+   Catalog Paging
+   ============================================================================ */
+
+// Load a cursor-paginated catalog endpoint ({results, next}) one page at a time,
+// fetching the next page whenever `sentinel` scrolls into view.
+// onPage(results, first) renders a page; first is true for the first page of a load.
+const pageCatalog = (sentinel, onPage) => {
+  let url = null;
+  let params = {};
+  let cursor = null;
+  let loading = false;
+  let generation = 0;
+
+  const nearSentinel = () => sentinel.getBoundingClientRect().top < window.innerHeight + 400;
+
+  const loadNext = async () => {
+    if (!url || loading || cursor === undefined) return;
+    loading = true;
+    const current = generation;
+    const query = new URLSearchParams(cursor === null ? params : { ...params, after: cursor });
+    try {
+      const response = await fetch(`${url}?${query}`);
+      const data = await response.json();
+      if (current !== generation) return; // filters changed while this page was in flight
+      onPage(data.results, cursor === null);
+      cursor = data.next === null ? undefined : data.next;
+    } finally {
+      if (current === generation) loading = false;
+    }
+    // A short page may leave the sentinel on screen, where the observer will not fire again
+    if (cursor !== undefined && nearSentinel()) loadNext();
+  };
+
+  new IntersectionObserver(entries => {
+    if (entries.some(entry => entry.isIntersecting)) loadNext();
+  }, { rootMargin: '400px' }).observe(sentinel);
+
+  return {
+    load(newUrl, newParams = {}) {
+      generation += 1;
+      url = newUrl;
+      params = Object.fromEntries(Object.entries(newParams).filter(([, value]) => value));
+      cursor = null;
+      loading = false;
+      loadNext();
+    }
+  };
+};
+
 /* ============================================================================
    Chat Widget System
    ============================================================================ */
@@ -541,18 +654,11 @@ const initializeChatWidget = () => {
     sendBtn.textContent = 'Sending...';
 
     try {
-      const response = await fetch('/chat', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message })
+      const replyText = appendChatMessage('', 'ai');
+      await streamChat(message, (fragment, reply) => {
+        replyText.textContent = reply;
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
       });
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
-      appendChatMessage(data.reply || 'No response received', 'ai');
     } catch (error) {
       console.error('Chat error:', error);
       appendChatMessage(`Error: ${error.message}`, 'ai');
@@ -585,6 +691,7 @@ const initializeChatWidget = () => {
     bubble.appendChild(messageText);
     messagesContainer.appendChild(bubble);
     messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    return messageText;
   }
 };
 
@@ -608,11 +715,14 @@ window.SmartEdu = {
   showNotification,
   debounce,
   throttle,
+  escapeHtml,
   animate,
   FormHandler,
   Modal,
   ThemeManager,
-  TrackEvent: trackEvent
+  TrackEvent: trackEvent,
+  streamChat,
+  pageCatalog
 };
 
 console.log('✨ SmartEdu Pro - Premium Educational Platform Ready');
@@ -0,0 +1,194 @@
+# Per-Process Stores
+# The pieces every cache, limiter and session store here is built from: one lazily
+# created object per app and worker, per-thread SQLite connections that survive a
+# gunicorn fork, and a TTL + LRU cache that can share its entries through SQLite.
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+
+_singleton_lock = threading.RLock()  # reentrant: one factory may ask for another singleton
+
+
+def app_singleton(name, factory):
+    """``current_app.extensions[name]``, built by ``factory(config)`` the first time a worker asks.
+
+    Built after fork, on first use, so every gunicorn worker gets its own
+    threads and connections; the lock makes sure a factory that starts a
+    thread runs once even when the first requests arrive together.
+    """
+    extensions = current_app.extensions
+    if name not in extensions:
+        with _singleton_lock:
+            if name not in extensions:
+                extensions[name] = factory(current_app.config)
+    return extensions[name]
+
+
+class SqliteFile:
+    """Per-thread connections to a SQLite file several workers share.
+
+    sqlite3 connections can't cross threads or a fork, so each thread opens
+    its own and reopens it in a forked child. ``schema`` statements (CREATE
+    ... IF NOT EXISTS) run on every new connection, so the tables exist
+    without any DDL at app startup.
+    """
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in self.schema:
+                conn.execute(statement)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def execute(self, sql, params=()):
+        return self.connection().execute(sql, params)
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE takes the write lock up front, so read-modify-write is atomic across workers"""
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+
+class TTLCache:
+    """TTL + LRU cache, optionally shared through a SQLite table.
+
+    The in-memory layer is per worker, capped at ``maxsize`` entries and,
+    with ``maxbytes``, at that much total value length. With ``path`` set,
+    misses fall through to ``table`` in a SQLite file every worker on the
+    host reads and writes; keys and values must then be strings.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, maxbytes=None, path=None, table=None, column='value'):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.path = path
+        self.table = table
+        self.column = column
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.db = None
+        if path:
+            self.db = SqliteFile(path, (
+                f'''CREATE TABLE IF NOT EXISTS {table} (
+                        key TEXT PRIMARY KEY,
+                        {column} TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        used_at REAL NOT NULL)''',
+                f'CREATE INDEX IF NOT EXISTS ix_{table}_used_at ON {table} (used_at)'))
+
+    def peek(self, key):
+        """(value, came from the shared table) for a key, or (None, False); not counted in the stats"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1], False
+                self._forget(key)
+
+        if self.db:
+            row = self.db.execute(f'SELECT {self.column}, expires_at FROM {self.table} WHERE key = ? AND expires_at > ?',
+                                  (key, now)).fetchone()
+            if row:
+                self.db.execute(f'UPDATE {self.table} SET used_at = ? WHERE key = ?', (now, key))
+                with self._lock:
+                    self._remember(key, row[0], row[1])
+                return row[0], True
+        return None, False
+
+    def count(self, hit, shared=False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.shared_hits += shared
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Cached value for a key, or None"""
+        value, shared = self.peek(key)
+        self.count(value is not None, shared)
+        return value
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+        if self.db:
+            self.db.execute(f'INSERT OR REPLACE INTO {self.table} (key, {self.column}, expires_at, used_at) '
+                            f'VALUES (?, ?, ?, ?)', (key, value, expires_at, now))
+            self.db.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+            self.db.execute(f'''DELETE FROM {self.table} WHERE key IN (
+                                    SELECT key FROM {self.table} ORDER BY used_at DESC LIMIT -1 OFFSET ?)''',
+                            (self.maxsize,))
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._forget(key)
+        if self.db:
+            self.db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def _size(self, value):
+        return len(value) if self.maxbytes is not None else 0
+
+    def _forget(self, key):
+        self._bytes -= self._size(self._entries.pop(key)[1])
+
+    def _remember(self, key, value, expires_at):
+        size = self._size(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return  # would evict everything else and still not fit
+        if key in self._entries:
+            self._forget(key)
+        self._entries[key] = (expires_at, value)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.maxsize
+                                 or (self.maxbytes is not None and self._bytes > self.maxbytes)):
+            self._forget(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.db:
+            self.db.execute(f'DELETE FROM {self.table}')
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {'size': len(self._entries), 'maxsize': self.maxsize, 'ttl': self.ttl}
+            if self.maxbytes is not None:
+                stats.update(bytes=self._bytes, maxbytes=self.maxbytes)
+            stats.update(shared=bool(self.db), hits=self.hits, shared_hits=self.shared_hits, misses=self.misses,
+                         hit_rate=round(self.hits / lookups, 3) if lookups else 0.0)
+            return stats
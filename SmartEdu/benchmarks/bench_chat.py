@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Benchmark /chat against the local stub API: per-call requests.post vs the pooled client (both
+through the /chat route at the same client concurrency), time-to-first-token for buffered vs streamed (SSE) replies, and coalescing of identical questions"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from stub_groq import start_stub
+
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "30"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "3"))
+DELAY = float(os.getenv("STUB_DELAY", "0.2"))
+
+stub, stub_url = start_stub(delay=DELAY)
+os.environ['GROQ_API_URL'] = stub_url
+os.environ['GROQ_API_KEY'] = 'stub'
+os.environ.setdefault('CHAT_RATE', '0')  # every simulated client shares 127.0.0.1
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+from app.main.groq import ChatError, GroqClient
+
+app = create_app()
+
+
+class RequestsClient:
+    """The original /chat upstream call behind GroqClient's interface: requests.post, a fresh
+    connection per message and no cap on calls in flight"""
+
+    def __init__(self, base_url, model, timeout=20):
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+
+    def complete(self, api_key, messages, temperature=0.7):
+        try:
+            response = requests.post(
+                f"{self.base_url}/chat/completions",
+                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                json={"model": self.model, "messages": messages, "temperature": temperature},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise ChatError(f"Network error contacting Groq API: {e}")
+        if response.status_code != 200:
+            raise ChatError(f"Groq API error: {response.status_code}")
+        return response.json()["choices"][0]["message"]["content"]
+
+
+def route_chat(tag):
+    """POST /chat with the given upstream client; tagged so no run is answered from another's cache"""
+    def chat(message):
+        with app.test_client() as client:
+            return client.post('/chat', json={'message': f'{tag} {message}'}).status_code
+    return chat
+
+
+def run(fn):
+    latencies, statuses = [], []
+    lock = threading.Lock()
+
+    def worker(i):
+        for r in range(ROUNDS):
+            start = time.perf_counter()
+            status = fn(f"question {i}-{r}")
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses.append(status)
+
+    calls, connections = stub.calls, stub.connections
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'ok': statuses.count(200),
+        'busy': statuses.count(503),
+        'upstream': stub.calls - calls,
+        'connections': stub.connections - connections,
+    }
+
+
+config = app.config
+cap = config['GROQ_MAX_CONCURRENCY']
+clients = (
+    ("requests.post per call", RequestsClient(stub_url, config['GROQ_MODEL'], config['GROQ_TIMEOUT'])),
+    # Uncapped like the original: the like-for-like comparison
+    (f"pooled, cap {CLIENTS}", GroqClient(stub_url, config['GROQ_MODEL'], config['GROQ_TIMEOUT'],
+                                          CLIENTS, config['GROQ_MAX_QUEUE'])),
+    # The configured cap: throughput tops out near cap / stub delay, by design
+    (f"pooled, cap {cap} (config)", GroqClient(stub_url, config['GROQ_MODEL'], config['GROQ_TIMEOUT'],
+                                               cap, config['GROQ_MAX_QUEUE'])),
+)
+
+print(f"\n📊 /chat benchmark ({CLIENTS} clients x {ROUNDS} rounds through the /chat route, "
+      f"stub delay {DELAY}s)\n")
+print("=" * 72)
+for name, upstream in clients:
+    app.extensions['groq_client'] = upstream
+    fn = route_chat(name)
+    fn("warm up")  # client start-up (loop thread, TLS context) is not what we measure
+    r = run(fn)
+    print(f"{name:24} {r['rps']:7.1f} req/s  p50 {r['p50']:7.1f} ms  p99 {r['p99']:7.1f} ms  "
+          f"ok {r['ok']:3}  503 {r['busy']:3}  conns {r['connections']}")
+print("=" * 72)
+app.extensions.pop('groq_client')  # the rest runs on the configured client
+
+
+def first_token(stream, tag):
+    """Seconds until the first piece of the reply reaches the browser"""
+    with app.test_client() as client:
+        start = time.perf_counter()
+        response = client.post('/chat', json={'message': f'what is a variable {tag}', 'stream': stream},
+                               buffered=False)
+        for chunk in response.response:
+            if chunk:
+                elapsed = time.perf_counter() - start
+                break
+        response.close()
+        return elapsed
+
+
+print("\nTime to first token (single client)")
+for name, stream in (("buffered JSON reply", False), ("streamed SSE reply", True)):
+    samples = sorted(first_token(stream, f'{name} {n}') for n in range(5))  # distinct, so not cached
+    print(f"{name:24} median {samples[2] * 1000:7.1f} ms")
+print("=" * 72)
+
+
+def burst(message, stream):
+    """CLIENTS students asking the same new question at once; returns upstream calls made and full replies"""
+    app.extensions['chat_cache'] and app.extensions['chat_cache'].clear()
+    calls = stub.calls
+    statuses = []
+
+    def ask():
+        with app.test_client() as client:
+            response = client.post('/chat', json={'message': message, 'stream': stream})
+            # Read the whole body: a streamed reply nobody reads is cut off, and its followers with it
+            body = response.get_data(as_text=True)
+            whole = 'event: done' in body and 'event: error' not in body if stream else 'Stub answer' in body
+            statuses.append(response.status_code if whole else None)
+
+    threads = [threading.Thread(target=ask) for _ in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stub.calls - calls, statuses.count(200)
+
+
+print(f"\nIdentical question from {CLIENTS} clients at once")
+for name, stream in (("buffered JSON reply", False), ("streamed SSE reply", True)):
+    upstream, ok = burst(f"what is recursion ({name})", stream)
+    print(f"{name:24} upstream calls {upstream:3}  ok {ok:3}")
+print("=" * 72)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Benchmark repeat page views: full render vs If-None-Match revalidation answered with 304.
+
+A signed-in test client opens each page once, then fetches it again with and
+without the ETag it was given, the way a browser revisiting the page would.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "300"))
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ['DATABASE_FILE'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DB_AUTO_MIGRATE'] = '1'
+
+from app import create_app  # noqa: E402
+
+app = create_app()
+client = app.test_client()
+client.post('/auth/signup', data={'username': 'bench', 'email': 'bench@example.com',
+                                  'password': 'bench-password', 'confirm_password': 'bench-password'})
+client.get('/')  # shows (and clears) the welcome flash, which pages never answer with 304
+
+PAGES = [
+    ("book detail", '/elibrary/book/algorithms'),
+    ("book reader", '/elibrary/book/algorithms/read?page=2'),
+    ("module detail", '/elearning/course/python-basics/module/module1'),
+    ("lesson", '/elearning/course/python-basics/module/module1/lesson/1'),
+]
+
+
+def timed(url, headers):
+    samples = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+    return response, samples
+
+
+print(f"\n📊 Conditional page benchmark ({REQUESTS} repeat views per page, signed in)\n")
+print("=" * 78)
+for name, url in PAGES:
+    etag = client.get(url).headers['ETag']
+    full, full_times = timed(url, {})
+    cached, cached_times = timed(url, {'If-None-Match': etag})
+    full_ms = statistics.median(full_times) * 1000
+    cached_ms = statistics.median(cached_times) * 1000
+    print(f"{name:14} {full.status_code} {len(full.data):6,} B {full_ms:6.2f} ms   "
+          f"{cached.status_code} {len(cached.data):2} B {cached_ms:6.2f} ms   ({full_ms / cached_ms:4.1f}x)")
+print("=" * 78)
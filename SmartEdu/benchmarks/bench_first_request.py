@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Benchmark the first request to each page in a freshly started worker.
+
+Every sample is a fresh interpreter, like a gunicorn worker after a deploy
+or recycle. Templates are either compiled from source on first use, loaded
+from the bytecode cache `flask precompile-templates` fills, or loaded from
+that cache before the first request as gunicorn's post_worker_init does.
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RUNS = int(os.getenv("BENCH_RUNS", "7"))
+
+ROUTES = [
+    '/auth/login',
+    '/',
+    '/elearning/',
+    '/elibrary/',
+    '/elibrary/book/algorithms',
+    '/elibrary/book/algorithms/read',
+    '/elearning/course/python-basics/module/module1',
+    '/elearning/course/python-basics/module/module1/lesson/1',
+    '/auth/profile',
+]
+
+PROBE = """
+import json, sys, time
+from app import create_app, load_templates
+app = create_app()
+client = app.test_client()
+if sys.argv[1] == 'preload':
+    with app.app_context():
+        load_templates(app)
+client.post('/auth/login', data={'username': 'bench', 'password': 'bench-password'})
+timings = {}
+for url in %r:
+    start = time.perf_counter()
+    status = client.get(url).status_code
+    timings[url] = time.perf_counter() - start
+    assert status == 200, (url, status)
+print(json.dumps(timings))
+""" % (ROUTES,)
+
+
+def sample(mode, env):
+    output = subprocess.run([sys.executable, '-c', PROBE, mode], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+workdir = tempfile.mkdtemp()
+cache_dir = os.path.join(workdir, 'templates')
+base = dict(os.environ, DATABASE_FILE=os.path.join(workdir, 'bench.db'), DB_AUTO_MIGRATE='0')
+subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=ROOT, env=base,
+               check=True, capture_output=True)
+subprocess.run([sys.executable, '-c', "from app import create_app; c = create_app().test_client(); "
+                "c.post('/auth/signup', data={'username': 'bench', 'email': 'bench@example.com', "
+                "'password': 'bench-password', 'confirm_password': 'bench-password'})"],
+               cwd=ROOT, env=dict(base, TEMPLATE_CACHE_DIR=''), check=True, capture_output=True)
+
+modes = [
+    ("compile", 'lazy', dict(base, TEMPLATE_CACHE_DIR='')),
+    ("bytecode", 'lazy', dict(base, TEMPLATE_CACHE_DIR=cache_dir)),
+    ("preloaded", 'preload', dict(base, TEMPLATE_CACHE_DIR=cache_dir)),
+]
+subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'precompile-templates'], cwd=ROOT,
+               env=dict(base, TEMPLATE_CACHE_DIR=cache_dir), check=True, capture_output=True)
+
+results = {}
+for name, mode, env in modes:
+    runs = [sample(mode, env) for _ in range(RUNS)]
+    results[name] = {url: statistics.median(run[url] for run in runs) * 1000 for url in ROUTES}
+shutil.rmtree(workdir, ignore_errors=True)
+
+print(f"\n📊 First request per route in a fresh worker (median of {RUNS} interpreters, ms)\n")
+print("=" * 88)
+print(f"{'route':56}" + "".join(f"{name:>10}" for name, _, _ in modes))
+for url in ROUTES:
+    print(f"{url:56}" + "".join(f"{results[name][url]:10.1f}" for name, _, _ in modes))
+print("-" * 88)
+print(f"{'total':56}" + "".join(f"{sum(results[name].values()):10.1f}" for name, _, _ in modes))
+print("=" * 88)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Benchmark full page renders with the {% cache %} fragment cache off and on.
+
+A signed-in, enrolled test client fetches each page repeatedly without
+validators, so every request renders; the fragment stats show per-block hit rates.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "300"))
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ['DATABASE_FILE'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DB_AUTO_MIGRATE'] = '1'
+
+from app import create_app  # noqa: E402
+from app.fragments import get_fragment_cache  # noqa: E402
+
+app = create_app()
+client = app.test_client()
+client.post('/auth/signup', data={'username': 'bench', 'email': 'bench@example.com',
+                                  'password': 'bench-password', 'confirm_password': 'bench-password'})
+client.get('/elearning/course/python-basics/enroll')
+
+PAGES = [
+    ("book reader", '/elibrary/book/algorithms/read?page=2'),
+    ("module detail", '/elearning/course/python-basics/module/module1'),
+    ("lesson", '/elearning/course/python-basics/module/module1/lesson/1'),
+]
+
+
+def median_ms(url):
+    client.get(url)
+    samples = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        client.get(url)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def configure(size):
+    app.config['FRAGMENT_CACHE_SIZE'] = size
+    app.extensions.pop('fragment_cache', None)
+
+
+print(f"\n📊 Fragment cache benchmark ({REQUESTS} renders per page, median)\n")
+print("=" * 60)
+results = {}
+for size in (0, 1024):
+    configure(size)
+    results[size] = [median_ms(url) for _, url in PAGES]
+for (name, _), off, on in zip(PAGES, results[0], results[1024]):
+    print(f"{name:14} off {off:6.2f} ms   on {on:6.2f} ms   ({off / on:4.2f}x)")
+print("=" * 60)
+with app.app_context():
+    for block, counts in get_fragment_cache().stats()['blocks'].items():
+        print(f"{block:16} hit rate {counts['hit_rate']:.3f} ({counts['hits']} hits, {counts['misses']} misses)")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""Benchmark catalog loading: per-row ORM upserts (the old loader) vs the chunked streaming import"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from sqlalchemy import text
+
+from app import create_app
+from app.catalog import ANSWER_LETTERS
+from app.catalog_import import load_catalog, read_records
+from app.models import db, Course, Book, Chapter, Module, Quiz
+
+COURSES = int(os.getenv("BENCH_COURSES", "10000"))
+BOOKS = int(os.getenv("BENCH_BOOKS", "1000"))  # 5 chapters each
+MODULES = int(os.getenv("BENCH_MODULES", "1000"))  # 4 quiz questions each
+
+app = create_app()
+path = os.path.join(tempfile.mkdtemp(), 'catalog.jsonl')
+with open(path, 'w', encoding='utf-8') as f:
+    for n in range(COURSES):
+        f.write(json.dumps({'type': 'course', 'slug': f'course-{n}', 'title': f'Course {n}', 'instructor': 'A. Teacher',
+                            'level': 'Beginner', 'category': 'programming', 'description': 'Learn things. ' * 10}) + '\n')
+    for n in range(BOOKS):
+        f.write(json.dumps({'type': 'book', 'slug': f'book-{n}', 'title': f'Book {n}', 'author': 'An Author',
+                            'isbn': f'978-{n:010d}', 'pages': 300, 'category': 'Computer Science',
+                            'chapters': [{'number': c, 'title': f'Chapter {c}', 'content': '## Heading\n\nText. ' * 50}
+                                         for c in range(1, 6)]}) + '\n')
+    for n in range(MODULES):
+        f.write(json.dumps({'type': 'module', 'slug': f'module-{n}', 'course_id': f'course-{n}', 'order': 1,
+                            'title': f'Module {n}', 'learning_objectives': ['one', 'two'],
+                            'quiz': [{'question': f'Q{q}?', 'options': ['a', 'b', 'c', 'd'], 'correct': q}
+                                     for q in range(4)]}) + '\n')
+
+
+def orm_load():
+    """What the old load_catalog did: look up, add or update, one row at a time, one transaction"""
+    def upsert(model, lookup, values):
+        row = model.query.filter_by(**lookup).first()
+        if row is None:
+            row = model(**lookup)
+            db.session.add(row)
+        for key, value in values.items():
+            setattr(row, key, value)
+        return row
+
+    for _, kind, record in read_records(path):
+        record = dict(record)
+        if kind == 'course':
+            upsert(Course, {'slug': record.pop('slug')}, record)
+        elif kind == 'book':
+            chapters = record.pop('chapters')
+            book = upsert(Book, {'slug': record.pop('slug')}, record)
+            db.session.flush()
+            for chapter in chapters:
+                upsert(Chapter, {'book_id': book.id, 'number': chapter['number']},
+                       {'title': chapter['title'], 'content': chapter['content']})
+        else:
+            quiz = record.pop('quiz')
+            record['learning_objectives'] = json.dumps(record['learning_objectives'])
+            module = upsert(Module, {'course_id': record.pop('course_id'), 'module_id': record.pop('slug')}, record)
+            db.session.flush()
+            Quiz.query.filter_by(module_id=module.id).delete()
+            for order, q in enumerate(quiz, 1):
+                db.session.add(Quiz(module_id=module.id, question=q['question'], option_a='a', option_b='b',
+                                    option_c='c', option_d='d', correct_answer=ANSWER_LETTERS[q['correct']],
+                                    order=order))
+    db.session.commit()
+
+
+def reset():
+    with app.app_context():
+        for model in (Quiz, Module, Chapter, Book, Course):
+            model.query.delete()
+        db.session.commit()
+
+
+def timed(load):
+    """Run a load while another thread keeps committing small writes, like students saving progress"""
+    stalls = []
+    running = True
+
+    def writer():
+        with app.app_context():
+            while running:
+                start = time.perf_counter()
+                try:
+                    with db.engine.begin() as conn:
+                        conn.execute(text("UPDATE course SET students = students WHERE id = 1"))
+                except Exception:
+                    pass  # database is locked
+                stalls.append(time.perf_counter() - start)
+                time.sleep(0.01)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    start = time.perf_counter()
+    with app.app_context():
+        load()
+        rows = sum(model.query.count() for model in (Course, Book, Chapter, Module, Quiz))
+    elapsed = time.perf_counter() - start
+    running = False
+    thread.join()
+    return rows, elapsed, max(stalls) * 1000
+
+
+print(f"\n📊 Catalog import benchmark ({COURSES} courses, {BOOKS} books x 5 chapters, "
+      f"{MODULES} modules x 4 questions)\n")
+print("=" * 86)
+for name, load, fresh in (("Per-row ORM, empty db", orm_load, True),
+                          ("Chunked import, empty db", lambda: load_catalog(path), True),
+                          ("Chunked import, refresh", lambda: load_catalog(path), False)):
+    if fresh:
+        reset()
+    rows, elapsed, stall = timed(load)
+    print(f"{name:26} {rows:7} rows in {elapsed:6.2f}s  {rows / elapsed:9,.0f} rows/s   "
+          f"longest concurrent write {stall:7.0f} ms")
+print("=" * 86)
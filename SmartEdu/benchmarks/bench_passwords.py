@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Benchmark a login storm: hashing in request threads vs the bounded hashing pool"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+from app.auth.passwords import PasswordHasher
+
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "16"))  # students logging in at the same moment
+LOGINS = int(os.getenv("BENCH_LOGINS", "4"))  # logins per student
+WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+
+app = create_app()
+app.config['WTF_CSRF_ENABLED'] = False
+method = app.config['PASSWORD_HASH_METHOD']
+for student in range(CLIENTS):
+    app.test_client().post('/auth/signup', data={'username': f'student{student}', 'email': f's{student}@school.test',
+                                                 'password': 'letmein1', 'confirm_password': 'letmein1'})
+
+
+def p99(samples):
+    return statistics.quantiles(samples, n=100)[98] if len(samples) > 1 else samples[0]
+
+
+def storm(hasher):
+    app.extensions['password_hasher'] = hasher
+    hasher.start()
+    logins, pages, statuses = [], [], []
+    running = True
+
+    def student(n):
+        client = app.test_client()
+        for _ in range(LOGINS):
+            start = time.perf_counter()
+            r = client.post('/auth/login', data={'username': f'student{n}', 'password': 'letmein1'})
+            logins.append(time.perf_counter() - start)
+            statuses.append(r.status_code)
+
+    def browser():
+        # Someone already logged in, paging the catalog during the storm
+        client = app.test_client()
+        while running:
+            start = time.perf_counter()
+            client.get('/elearning/api/courses')
+            pages.append(time.perf_counter() - start)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=student, args=(n,)) for n in range(CLIENTS)]
+    reader = threading.Thread(target=browser)
+    start = time.perf_counter()
+    reader.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    running = False
+    reader.join()
+    ok = statuses.count(302)
+    return ok / elapsed, p99(logins) * 1000, p99(pages) * 1000, len(statuses) - ok
+
+
+print(f"\n📊 Login storm benchmark ({CLIENTS} students x {LOGINS} logins, {method})\n")
+print("=" * 78)
+for name, workers in (("Hash in request thread", 0), (f"Hashing pool ({WORKERS} procs)", WORKERS)):
+    rate, login_p99, page_p99, rejected = storm(PasswordHasher(method, workers))
+    print(f"{name:26} {rate:6.1f} logins/s   login p99 {login_p99:7.0f} ms   "
+          f"catalog p99 {page_p99:6.1f} ms   rejected {rejected}")
+print("=" * 78)
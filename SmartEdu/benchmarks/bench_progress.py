@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Benchmark quiz result persistence: one commit per submission vs the write-behind queue"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+from app.models import db, UserProgress
+from app.elearning.progress import ProgressWriter, progress_row, write_progress
+
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "32"))  # students submitting at the same moment
+SUBMISSIONS = int(os.getenv("BENCH_SUBMISSIONS", "50"))  # quizzes per student
+MODULES = 6
+
+app = create_app()
+
+
+def submissions(student):
+    rng = random.Random(student)
+    return [(student, rng.randint(1, MODULES), rng.randint(0, 100)) for _ in range(SUBMISSIONS)]
+
+
+def run(submit, finish=lambda: None):
+    with app.app_context():
+        UserProgress.query.delete()
+        db.session.commit()
+    threads = [threading.Thread(target=lambda s=s: [submit(*sub) for sub in submissions(s)])
+               for s in range(1, CLIENTS + 1)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    finish()  # count the time until every row is durable
+    elapsed = time.perf_counter() - start
+    with app.app_context():
+        rows = UserProgress.query.count()
+        best = db.session.query(db.func.sum(UserProgress.quiz_score)).scalar()
+    return CLIENTS * SUBMISSIONS / elapsed, rows, best
+
+
+with app.app_context():
+    engine = db.engine
+
+per_request = run(lambda user, module, score: write_progress(engine, [progress_row(user, module, score)]))
+writer = ProgressWriter(engine, app.config['PROGRESS_BATCH_SIZE'], app.config['PROGRESS_FLUSH_INTERVAL'])
+batched = run(writer.record, lambda: writer.flush(60))
+
+print(f"\n📊 Progress write benchmark ({CLIENTS} students x {SUBMISSIONS} quiz submissions)\n")
+print("=" * 72)
+print(f"One commit per submission : {per_request[0]:9.0f} submissions/s  ({per_request[1]} rows)")
+print(f"Write-behind queue        : {batched[0]:9.0f} submissions/s  ({batched[1]} rows, "
+      f"{writer.batches} transactions)")
+print(f"Same final state          : {per_request[1:] == batched[1:]}")
+print("=" * 72)
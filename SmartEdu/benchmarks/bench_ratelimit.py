@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Benchmark /chat under abuse: one client hammering the endpoint while other students chat"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from stub_groq import start_stub
+
+HAMMER = int(os.getenv("BENCH_HAMMER", "200"))  # requests from the abusive client
+STUDENTS = int(os.getenv("BENCH_STUDENTS", "10"))
+DELAY = float(os.getenv("STUB_DELAY", "0.2"))
+
+stub, stub_url = start_stub(delay=DELAY)
+os.environ['GROQ_API_URL'] = stub_url
+os.environ['GROQ_API_KEY'] = 'stub'
+os.environ['CHAT_CACHE_SIZE'] = '0'  # every request should want the upstream API
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+
+app = create_app()
+
+
+def ask(address, message):
+    with app.test_client() as client:
+        start = time.perf_counter()
+        response = client.post('/chat', json={'message': message},
+                               environ_base={'REMOTE_ADDR': address})
+        return response.status_code, time.perf_counter() - start
+
+
+def hammer(results):
+    for i in range(HAMMER):
+        results.append(ask('10.0.0.66', f"spam {i}"))
+
+
+def student(i, results):
+    results.append(ask(f'10.0.1.{i}', f"student question {i}"))
+
+
+abuse, students = [], []
+calls = stub.calls
+threads = [threading.Thread(target=hammer, args=(abuse,))]
+threads += [threading.Thread(target=student, args=(i, students)) for i in range(STUDENTS)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+
+def summary(results, status):
+    times = sorted(t for s, t in results if s == status)
+    if not times:
+        return f"{status}: {0:4}"
+    return f"{status}: {len(times):4}  p50 {times[len(times) // 2] * 1000:7.2f} ms"
+
+
+config = app.config
+print(f"\n📊 /chat rate limit benchmark (rate {config['CHAT_RATE']}/s, burst {config['CHAT_BURST']}, "
+      f"stub delay {DELAY}s)\n")
+print("=" * 72)
+print(f"Abusive client ({HAMMER} requests)   {summary(abuse, 200)}   {summary(abuse, 429)}")
+print(f"Students ({STUDENTS}, one each)        {summary(students, 200)}   {summary(students, 429)}")
+print(f"Upstream calls made              : {stub.calls - calls}")
+print("=" * 72)
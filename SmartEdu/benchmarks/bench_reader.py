@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Benchmark worker memory as the library grows: chapters read on demand vs every chapter held in memory
+
+Each library size runs in a fresh interpreter so resident set sizes are comparable.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+SIZES = [int(n) for n in os.getenv("BENCH_CHAPTERS", "100,400,1600").split(',')]  # chapters in the library
+CHAPTER_KB = int(os.getenv("BENCH_CHAPTER_KB", "50"))
+READS = int(os.getenv("BENCH_READS", "300"))  # random chapter views per run
+PER_BOOK = 10
+
+
+def rss_mb():
+    """(private, file-backed) resident memory in MB; mmap'd database pages are file-backed and shared"""
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            fields[name] = int(value.split()[0]) / 1024 if value.strip().endswith('kB') else 0
+    return fields.get('RssAnon', 0.0), fields.get('RssFile', 0.0) + fields.get('RssShmem', 0.0)
+
+
+def build(chapters, database):
+    """Load a generated library into a fresh database (in its own process, so the import doesn't skew RSS)"""
+    os.environ['DATABASE_FILE'] = database
+    from app import create_app
+    from app.catalog_import import load_catalog
+
+    app = create_app()
+    paragraph = '## Section\n\n' + 'The quick brown fox studies algorithms and data structures. ' * 16 + '\n\n'
+    path = os.path.join(tempfile.mkdtemp(), 'library.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        for b in range(chapters // PER_BOOK):
+            f.write(json.dumps({'type': 'book', 'slug': f'book-{b}', 'title': f'Book {b}', 'chapters': [
+                {'number': n, 'title': f'Chapter {n}', 'content': paragraph * (CHAPTER_KB * 1024 // len(paragraph))}
+                for n in range(1, PER_BOOK + 1)]}) + '\n')
+    with app.app_context():
+        load_catalog(path)
+
+
+def measure(chapters, database):
+    os.environ['DATABASE_FILE'] = database
+    os.environ['DB_AUTO_MIGRATE'] = '0'  # a worker booting against an already-loaded database
+    from app import create_app
+    from app.catalog import iter_chapters
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    rng = random.Random(chapters)
+    books = chapters // PER_BOOK
+    client = app.test_client()
+    client.post('/auth/signup', data={'username': 'reader', 'email': 'r@school.test',
+                                      'password': 'letmein1', 'confirm_password': 'letmein1'})
+    start = time.perf_counter()
+    for _ in range(READS):
+        response = client.get(f'/elibrary/book/book-{rng.randrange(books)}/read?page={rng.randint(1, PER_BOOK)}')
+        assert response.status_code == 200
+    elapsed = time.perf_counter() - start
+    private, shared = rss_mb()
+
+    # What keeping every chapter in a module-level dict costs each worker
+    with app.app_context():
+        held = {(slug, number): text for slug, number, text in iter_chapters()}
+    return {'private': private, 'shared': shared, 'held': rss_mb()[0], 'ms': elapsed / READS * 1000,
+            'chapters': len(held)}
+
+
+if len(sys.argv) > 1:
+    mode, size, database = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    if mode == 'build':
+        build(size, database)
+    else:
+        print(json.dumps(measure(size, database)))
+    sys.exit()
+
+print(f"\n📊 Reader memory benchmark ({CHAPTER_KB} KB chapters, {READS} random chapter views per worker)\n")
+print("=" * 90)
+for size in SIZES:
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    subprocess.run([sys.executable, __file__, 'build', str(size), database], check=True, capture_output=True)
+    output = subprocess.run([sys.executable, __file__, 'serve', str(size), database], check=True,
+                            capture_output=True, text=True).stdout
+    r = json.loads(output.strip().splitlines()[-1])
+    print(f"{r['chapters']:5} chapters ({r['chapters'] * CHAPTER_KB / 1024:5.1f} MB)   "
+          f"worker private {r['private']:6.1f} MB + shared mmap {r['shared']:5.1f} MB   "
+          f"all held {r['held']:6.1f} MB   {r['ms']:4.1f} ms/view")
+print("=" * 90)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Benchmark catalog search: inverted index vs scanning every course, as the catalog grows"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.search import SearchIndex, tokenize
+
+SIZES = [int(n) for n in os.getenv("BENCH_SIZES", "100,1000,10000").split(',')]
+QUERIES = ["pyth", "data sci", "john", "advanced java", "calc", "web dev"]
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "50"))
+WORDS = ("python java data science web development calculus algebra machine learning cloud security "
+         "networks design advanced basics mastery fundamentals react mobile databases").split()
+PEOPLE = "John Smith Sarah Johnson Alex Kumar Emma Wilson David Zhang Lisa Park Elena Garcia".split()
+FIELDS = {'name': 3, 'instructor': 2, 'category': 1.5, 'level': 1}
+
+
+def build_catalog(size):
+    rng = random.Random(size)
+    return [{
+        'id': f'course-{i}',
+        'name': ' '.join(rng.sample(WORDS, 3)).title(),
+        'instructor': ' '.join(rng.sample(PEOPLE, 2)),
+        'level': rng.choice(['Beginner', 'Intermediate', 'Advanced']),
+        'category': rng.choice(['programming', 'web', 'data', 'math', 'cloud']),
+    } for i in range(size)]
+
+
+def scan(catalog, query):
+    """What the pages did in the browser: test every course against every term"""
+    terms = tokenize(query)
+    hits = []
+    for course in catalog:
+        words = tokenize(' '.join(course[field] for field in FIELDS))
+        if all(any(word.startswith(term) for word in words) for term in terms):
+            hits.append(course)
+    return hits
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (ROUNDS * len(QUERIES)) * 1000
+
+
+print(f"\n📊 Catalog search benchmark ({len(QUERIES)} queries x {ROUNDS} rounds)\n")
+print("=" * 64)
+for size in SIZES:
+    catalog = build_catalog(size)
+    index = SearchIndex(FIELDS)
+    start = time.perf_counter()
+    index.sync((course['id'], course) for course in catalog)
+    build = (time.perf_counter() - start) * 1000
+    assert all(index.search(q, size)[0] == len(scan(catalog, q)) for q in QUERIES)
+    linear = timed(lambda q: scan(catalog, q))
+    indexed = timed(lambda q: index.search(q, 20))
+    print(f"{size:6} courses  build {build:8.1f} ms  scan {linear:8.3f} ms  index {indexed:7.3f} ms/query")
+print("=" * 64)
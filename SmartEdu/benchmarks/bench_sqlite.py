@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""Benchmark mixed read/write traffic from several worker processes: stock SQLite vs the tuned engine.
+
+Each mode runs in a fresh interpreter because Config reads its settings from the
+environment at import time.
+"""
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+WORKERS = int(os.getenv("BENCH_WORKERS", "4"))  # gunicorn worker processes
+THREADS = int(os.getenv("BENCH_THREADS", "8"))  # threads per worker
+DURATION = float(os.getenv("BENCH_DURATION", "3"))
+WRITE_SHARE = float(os.getenv("BENCH_WRITES", "0.2"))  # profile updates vs page reads
+USERS = 200
+
+MODES = {
+    # What the app ran with before: rollback journal, full fsync, default cache, small pool
+    'stock': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_CACHE_SIZE': '2000',
+              'SQLITE_MMAP_SIZE': '0', 'DB_POOL_SIZE': '5', 'DB_MAX_OVERFLOW': '10'},
+    'tuned': {},
+}
+
+
+def worker(results):
+    from app import create_app
+    from app.catalog import get_course
+    from app.models import db, User
+
+    app = create_app()
+    with app.app_context():
+        db.engine.dispose()  # don't share the parent's pooled connections across fork
+        slugs = [slug for (slug,) in db.session.execute(db.text("SELECT slug FROM course"))]
+
+    ops, errors = [0], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + DURATION
+
+    def run(seed):
+        rng = random.Random(seed)
+        done = failed = 0
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    if rng.random() < WRITE_SHARE:
+                        user = db.session.get(User, rng.randint(1, USERS))
+                        user.learning_goal = f"goal {rng.random()}"
+                        db.session.commit()
+                    else:
+                        get_course(rng.choice(slugs))
+                        db.session.get(User, rng.randint(1, USERS))
+                        db.session.rollback()  # end the read transaction, like the end of a request
+                    done += 1
+                except Exception:
+                    db.session.rollback()
+                    failed += 1
+        with lock:
+            ops[0] += done
+            errors[0] += failed
+
+    threads = [threading.Thread(target=run, args=(os.getpid() * 100 + i,)) for i in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.put((ops[0], errors[0]))
+
+
+def run_mode():
+    from app import create_app
+    from app.models import db, User
+
+    app = create_app()
+    with app.app_context():
+        db.session.add_all(User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x")
+                           for i in range(USERS))
+        db.session.commit()
+        db.engine.dispose()
+
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=worker, args=(results,)) for _ in range(WORKERS)]
+    for p in procs:
+        p.start()
+    totals = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    print(json.dumps({'ops': sum(t[0] for t in totals), 'errors': sum(t[1] for t in totals)}))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--run']:
+        multiprocessing.set_start_method('fork')
+        run_mode()
+        sys.exit()
+
+    print(f"\n📊 SQLite mixed traffic benchmark ({WORKERS} workers x {THREADS} threads, "
+          f"{WRITE_SHARE:.0%} writes, {DURATION:.0f}s)\n")
+    print("=" * 64)
+    for name, settings in MODES.items():
+        env = dict(os.environ, **settings, DATABASE_FILE=os.path.join(tempfile.mkdtemp(), 'bench.db'))
+        output = subprocess.run([sys.executable, __file__, '--run'], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:6} {result['ops'] / DURATION:9.0f} ops/s   {result['errors']:5} failed "
+              f"(database is locked)")
+    print("=" * 64)
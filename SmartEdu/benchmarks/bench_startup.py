@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Benchmark worker boot: cold `import app` and create_app() with and without startup migrations.
+
+Every sample runs in a fresh interpreter, like a gunicorn worker starting.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RUNS = int(os.getenv("BENCH_RUNS", "7"))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+built = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': built - imported}))
+"""
+
+
+def sample(auto_migrate, database):
+    env = dict(os.environ, DB_AUTO_MIGRATE='1' if auto_migrate else '0', DATABASE_FILE=database)
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+sample(True, database)  # create and migrate the database once, as `flask init-db` would on deploy
+
+print(f"\n📊 Worker startup benchmark (median of {RUNS} fresh interpreters, database already migrated)\n")
+print("=" * 64)
+for name, auto_migrate in (("DB_AUTO_MIGRATE=1 (dev)", True), ("DB_AUTO_MIGRATE=0 (prod)", False)):
+    runs = [sample(auto_migrate, database) for _ in range(RUNS)]
+    imported = statistics.median(r['import'] for r in runs) * 1000
+    built = statistics.median(r['create_app'] for r in runs) * 1000
+    print(f"{name:26} import app {imported:7.1f} ms   create_app() {built:7.1f} ms")
+print("=" * 64)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Benchmark chapter table styling: the legacy regex chain vs the postprocessor.
+
+The legacy chain only striped the first tbody; the postprocessor stripes
+every one, so the row counts are printed next to the times. Markdown
+parsing dominates the full render either way.
+"""
+import os
+import re
+import sys
+import time
+
+import markdown
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.elibrary.render import TableStylePostprocessor, render_markdown
+
+TABLES = int(os.getenv("BENCH_TABLES", "40"))
+ROWS = int(os.getenv("BENCH_ROWS", "50"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "20"))
+
+
+def legacy_add_table_styles(html):
+    """The regex chain the reader used before the treeprocessor"""
+    html = re.sub(r'<table>', '<table style="width: 100%; border-collapse: collapse; margin: 1.5rem 0; border: 2px solid #ddd; background: #f9f9f9;">', html)
+    html = re.sub(r'<thead>', '<thead style="background: #e8e8e8;">', html)
+    html = re.sub(r'<th>', '<th style="padding: 1rem; text-align: left; font-weight: 700; border-bottom: 3px solid #333; color: #000;">', html)
+    html = re.sub(r'<td>', '<td style="padding: 0.75rem 1rem; color: #000; border-bottom: 1px solid #ddd;">', html)
+    tbody_match = re.search(r'<tbody>(.*?)</tbody>', html, re.DOTALL)
+    if tbody_match:
+        tbody_content = tbody_match.group(1)
+        tr_count = 0
+        def replace_tr(match):
+            nonlocal tr_count
+            tr_count += 1
+            bg_color = '#ffffff' if tr_count % 2 == 1 else '#f5f5f5'
+            border = 'border-bottom: 1px solid #ddd;' if 'tbody' in html else ''
+            return f'<tr style="background: {bg_color}; {border}">'
+        new_tbody = re.sub(r'<tr>', replace_tr, tbody_content)
+        html = html.replace(tbody_content, new_tbody)
+    return html
+
+
+def plain_render(text):
+    return markdown.markdown(text, extensions=['tables', 'fenced_code'])
+
+
+def legacy_render(text):
+    html = markdown.markdown(text, extensions=['tables', 'fenced_code'])
+    return legacy_add_table_styles(html)
+
+
+def build_chapter(tables, rows):
+    parts = ['## Benchmark Chapter\n']
+    for t in range(tables):
+        parts.append(f'### Table {t}\n\nSome text before the table.\n')
+        parts.append('| Name | Time | Space | Notes |')
+        parts.append('|------|------|-------|-------|')
+        for r in range(rows):
+            parts.append(f'| item {r} | O(n log n) | O(1) | row {r} of table {t} |')
+        parts.append('')
+    return '\n'.join(parts)
+
+
+def timed(fn, text):
+    """Best-of-ROUNDS wall time in ms, to keep GC and scheduler noise out"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+chapter = build_chapter(TABLES, ROWS)
+html = markdown.markdown(chapter, extensions=['tables', 'fenced_code'])
+postprocessor = TableStylePostprocessor(markdown.Markdown())
+
+print(f"\n📊 Chapter table styling benchmark ({TABLES} tables x {ROWS} rows, {len(chapter)} chars)\n")
+print("=" * 64)
+print("Styling pass alone, on the same rendered HTML:")
+for name, fn in (("Legacy regex (first table)", legacy_add_table_styles),
+                 ("Postprocessor (every table)", postprocessor.run)):
+    print(f"  {name:32}: {timed(fn, html):7.2f} ms  ({fn(html).count('<tr style=')} rows striped)")
+print("Full render:")
+plain = timed(plain_render, chapter)
+print(f"  {'Markdown, no styling':32}: {plain:7.2f} ms")
+print(f"  {'Legacy render (md + regex)':32}: {timed(legacy_render, chapter):7.2f} ms")
+print(f"  {'render_markdown':32}: {timed(render_markdown, chapter):7.2f} ms")
+print("=" * 64)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Local stand-in for the OpenAI-style /chat/completions API used by /chat"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DELAY = float(os.getenv("STUB_DELAY", "0.5"))  # seconds per completion
+FILLER = ("A variable is a named box that stores a value your program can read and change later, "
+          "like a labelled jar on a shelf.")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    # Headers and body go out in separate writes; with Nagle on, a kept-alive client's delayed ACK
+    # holds the body back ~40 ms. Real API servers set TCP_NODELAY too.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        if not self.path.endswith('/chat/completions'):
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        question = payload.get('messages', [{}])[-1].get('content', '')
+        self.server.calls += 1
+
+        reply = f"Stub answer to: {question}. " + FILLER
+        if payload.get('stream'):
+            self.stream_reply(reply)
+            return
+
+        time.sleep(self.server.delay)
+        body = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "model": payload.get('model'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                         "finish_reason": "stop"}],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reply(self, reply):
+        """OpenAI-style SSE chunks, spreading the delay evenly across tokens"""
+        words = reply.split(' ')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for word in words:
+                time.sleep(self.server.delay / len(words))
+                chunk = {"choices": [{"index": 0, "delta": {"content": word + ' '}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the app cancelled the stream
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # a classroom connecting at once should not hit the accept backlog
+
+
+def start_stub(port=0, delay=DELAY):
+    """Serve the stub in a background thread; returns (server, base_url)"""
+    server = StubServer(('127.0.0.1', port), StubHandler)
+    server.delay = delay
+    server.calls = 0
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    server, url = start_stub(port)
+    print(f"Stub Groq API listening on {url} (delay {DELAY}s)")
+    print(f"Run the app with GROQ_API_URL={url} GROQ_API_KEY=stub")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -6,6 +6,56 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY") or "dev-secret-key-change-in-production"
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(BASE_DIR, os.getenv("DATABASE_FILE", "smartedu.db"))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SESSION_TYPE = 'filesystem'
-    PERMANENT_SESSION_LIFETIME = 86400  # 24 hours
+    DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"  # migrate and load the catalog in create_app; 0 leaves it to `flask init-db`
+    # SQLite tuning, applied to every pooled connection (see configure_sqlite)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # readers no longer block on writers
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # safe with WAL; fsync at checkpoints only
+    SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms to wait for a lock before "database is locked"
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "16384"))  # page cache per connection, in KiB
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)))  # bytes of the file read through mmap
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", os.getenv("GUNICORN_THREADS", "16"))),  # per worker, one per thread
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "4")),
+        "pool_timeout": 10,
+        "pool_pre_ping": False,  # local file, connections don't go stale
+    }
+    # Server-side sessions (app/sessions.py); the cookie holds only an opaque id
+    SESSION_DB = os.path.join(BASE_DIR, os.getenv("SESSION_DB", os.path.splitext(os.getenv("DATABASE_FILE", "smartedu.db"))[0] + "-sessions.db"))
+    PERMANENT_SESSION_LIFETIME = 86400  # 24 hours; also how long an idle server-side session is kept
+    SESSION_REFRESH_INTERVAL = int(os.getenv("SESSION_REFRESH_INTERVAL", "300"))  # seconds between expiry bumps for an unchanged session
+    SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", "300"))  # seconds between deletes of expired sessions
+    CHAPTER_CACHE_SIZE = int(os.getenv("CHAPTER_CACHE_SIZE", "256"))  # rendered chapters kept per worker
+    CHAPTER_CACHE_BYTES = int(os.getenv("CHAPTER_CACHE_BYTES", str(32 * 1024 * 1024)))  # cap on their total HTML size
+    CHAPTER_CACHE_WARM = os.getenv("CHAPTER_CACHE_WARM", "0") == "1"  # pre-render chapters at startup
+    TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", os.path.join(BASE_DIR, "__pycache__", "templates"))  # compiled template bytecode shared by every worker; empty disables
 
+    GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1")
+    GROQ_MODEL = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
+    GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "20"))  # seconds, including time queued
+    GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))  # upstream calls in flight per worker
+    GROQ_MAX_QUEUE = int(os.getenv("GROQ_MAX_QUEUE", "64"))  # chats allowed to wait before 503
+    CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "1024"))  # cached chatbot replies; 0 disables
+    CHAT_CACHE_TTL = int(os.getenv("CHAT_CACHE_TTL", "3600"))  # seconds
+    CHAT_CACHE_DB = os.getenv("CHAT_CACHE_DB", "")  # SQLite file shared by all workers; empty keeps it per worker
+    CHAT_RATE = float(os.getenv("CHAT_RATE", "0.5"))  # chats per second refilled per user/IP; 0 disables
+    CHAT_BURST = int(os.getenv("CHAT_BURST", "10"))  # chats a user/IP may send back to back
+    CHAT_MAX_INFLIGHT = int(os.getenv("CHAT_MAX_INFLIGHT", "32"))  # upstream chats in flight before 429; 0 disables
+    RATELIMIT_DB = os.getenv("RATELIMIT_DB", "")  # SQLite file shared by all workers; empty keeps limits per worker
+    PROXY_FIX_HOPS = int(os.getenv("PROXY_FIX_HOPS", "0"))  # reverse proxies in front of the app whose X-Forwarded-For/-Proto to trust; 0 trusts none
+    SEARCH_REFRESH_INTERVAL = float(os.getenv("SEARCH_REFRESH_INTERVAL", "30"))  # seconds before picking up catalog edits from other processes
+    CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "60"))  # seconds browsers may reuse catalog JSON before revalidating
+    PAGE_SHARED_MAX_AGE = int(os.getenv("PAGE_SHARED_MAX_AGE", "60"))  # seconds a reverse proxy may serve anonymous module pages without revalidating
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "1024"))  # rendered {% cache %} blocks kept per worker; 0 disables
+    FRAGMENT_CACHE_BYTES = int(os.getenv("FRAGMENT_CACHE_BYTES", str(8 * 1024 * 1024)))  # total HTML those blocks may hold
+    FRAGMENT_CACHE_TTL = int(os.getenv("FRAGMENT_CACHE_TTL", "3600"))  # seconds before a cached block is rendered again
+    FRAGMENT_CACHE_DB = os.getenv("FRAGMENT_CACHE_DB", "")  # SQLite file shared by all workers; empty keeps it per worker
+    PROGRESS_WRITE_BEHIND = os.getenv("PROGRESS_WRITE_BEHIND", "1") == "1"  # queue quiz/lesson progress and commit it in batches
+    PROGRESS_BATCH_SIZE = int(os.getenv("PROGRESS_BATCH_SIZE", "500"))  # progress rows per transaction
+    PROGRESS_FLUSH_INTERVAL = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "0.05"))  # longest a queued write waits before its batch commits
+    PROGRESS_RETRIES = int(os.getenv("PROGRESS_RETRIES", "3"))  # retries of a failed batch before its rows are written one at a time
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "4096"))  # logged-in users kept per worker; 0 disables
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))  # seconds another worker may show a stale profile
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")  # werkzeug method and cost; older hashes upgrade at login
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # hashing processes per worker; 0 hashes in the request thread
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))  # hashes allowed to wait before sign-in fails fast
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))  # seconds, including time queued
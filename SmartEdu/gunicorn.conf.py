@@ -0,0 +1,28 @@
+# Gunicorn Settings
+# Threaded workers: a chat turn waiting on the Groq client's async loop
+# parks one cheap thread instead of a whole worker process.
+import os
+
+# Workers boot without touching the schema; run `flask --app app init-db` before starting
+os.environ.setdefault("DB_AUTO_MIGRATE", "0")
+# Deployed behind one reverse proxy: trust its X-Forwarded-For, or every client shares the proxy's
+# chat rate-limit bucket. Keep the bind address reachable only by the proxy, or clients can forge it.
+os.environ.setdefault("PROXY_FIX_HOPS", "1")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+timeout = 60
+wsgi_app = "app:create_app()"
+
+
+def post_worker_init(worker):
+    # Fork the password hashing pool while the worker is still single-threaded
+    from app import load_templates
+    from app.auth.passwords import get_hasher
+    with worker.wsgi.app_context():
+        get_hasher().start()
+    # Templates come from the bytecode cache (see `flask precompile-templates`), so this is quick
+    # and spares the first requests a worker serves
+    load_templates(worker.wsgi)
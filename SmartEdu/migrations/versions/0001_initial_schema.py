@@ -0,0 +1,115 @@
+"""initial schema
+
+The tables as db.create_all() built them before migrations were introduced.
+Databases created that way are stamped at this revision on their first
+start (see init_db) and upgraded from here.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=120), nullable=True),
+        sa.Column('profile_picture', sa.String(length=255), nullable=True),
+        sa.Column('learning_goal', sa.String(length=255), nullable=True),
+        sa.Column('heard_from', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+    )
+    op.create_table('course',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('instructor', sa.String(length=120), nullable=True),
+        sa.Column('duration', sa.String(length=50), nullable=True),
+        sa.Column('level', sa.String(length=50), nullable=True),
+        sa.Column('students', sa.Integer(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('book',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('author', sa.String(length=120), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('isbn', sa.String(length=20), nullable=True),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('pages', sa.Integer(), nullable=True),
+        sa.Column('published_date', sa.DateTime(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('isbn')
+    )
+    op.create_table('module',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.String(length=100), nullable=False),
+        sa.Column('module_id', sa.String(length=100), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('information', sa.Text(), nullable=True),
+        sa.Column('video_url', sa.String(length=500), nullable=True),
+        sa.Column('video_duration', sa.String(length=20), nullable=True),
+        sa.Column('learning_objectives', sa.Text(), nullable=True),
+        sa.Column('resources', sa.Text(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('quiz',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('question', sa.String(length=500), nullable=False),
+        sa.Column('option_a', sa.String(length=200), nullable=False),
+        sa.Column('option_b', sa.String(length=200), nullable=False),
+        sa.Column('option_c', sa.String(length=200), nullable=False),
+        sa.Column('option_d', sa.String(length=200), nullable=False),
+        sa.Column('correct_answer', sa.String(length=1), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['module_id'], ['module.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('quiz_score', sa.Integer(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['module_id'], ['module.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_progress')
+    op.drop_table('quiz')
+    op.drop_table('module')
+    op.drop_table('book')
+    op.drop_table('course')
+    op.drop_table('user')
@@ -0,0 +1,79 @@
+"""catalog slugs, chapters, enrollments and progress upserts
+
+Replaces the ALTER TABLE block create_app used to run on every start.
+Each step checks what is already there, because databases stamped at 0001
+may have had some of it added by that block or by db.create_all().
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+ADDED_COLUMNS = [
+    ('book', sa.Column('slug', sa.String(length=100), nullable=True)),
+    ('course', sa.Column('slug', sa.String(length=100), nullable=True)),
+    ('course', sa.Column('category', sa.String(length=50), nullable=True)),
+    ('course', sa.Column('emoji', sa.String(length=16), nullable=True)),
+]
+
+ADDED_INDEXES = [
+    ('ix_book_slug', 'book', ['slug']),
+    ('ix_course_slug', 'course', ['slug']),
+    ('ix_user_progress_user_module', 'user_progress', ['user_id', 'module_id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for table, column in ADDED_COLUMNS:
+        if column.name not in [c['name'] for c in inspector.get_columns(table)]:
+            op.add_column(table, column)
+
+    if 'chapter' not in tables:
+        op.create_table('chapter',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('book_id', sa.Integer(), nullable=False),
+            sa.Column('number', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('content', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['book_id'], ['book.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('book_id', 'number')
+        )
+
+    if 'enrollment' not in tables:
+        op.create_table('enrollment',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('course_id', sa.String(length=100), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'course_id')
+        )
+
+    for name, table, columns in ADDED_INDEXES:
+        if name not in [i['name'] for i in inspector.get_indexes(table)]:
+            op.create_index(name, table, columns, unique=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(ADDED_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table('enrollment')
+    op.drop_table('chapter')
+    for table, column in reversed(ADDED_COLUMNS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(column.name)
@@ -0,0 +1,38 @@
+"""indexes for the catalog, module, quiz and progress access paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # get_module: course_id IN (slug, '*') AND module_id = ?; also what load_catalog upserts on
+    op.create_index('ix_module_course_module', 'module', ['course_id', 'module_id'], unique=True)
+    # Module listings for a course, in order
+    op.create_index('ix_module_course_order', 'module', ['course_id', 'order'], unique=False)
+    # A module's quiz questions, in order
+    op.create_index('ix_quiz_module_order', 'quiz', ['module_id', 'order'], unique=False)
+    # Keyset catalog pages filtered by level or category: WHERE level = ? AND id > ? ORDER BY id
+    op.create_index('ix_course_level_id', 'course', ['level', 'id'], unique=False)
+    op.create_index('ix_course_category_id', 'course', ['category', 'id'], unique=False)
+    op.create_index('ix_book_category_id', 'book', ['category', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_book_category_id', table_name='book')
+    op.drop_index('ix_course_category_id', table_name='course')
+    op.drop_index('ix_course_level_id', table_name='course')
+    op.drop_index('ix_quiz_module_order', table_name='quiz')
+    op.drop_index('ix_module_course_order', table_name='module')
+    op.drop_index('ix_module_course_module', table_name='module')
@@ -0,0 +1,32 @@
+"""case-insensitive username and email indexes for login and signup
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    for name, column in (('ix_user_username_lower', 'username'), ('ix_user_email_lower', 'email')):
+        # Accounts differing only in case predate this rule; keep them, with a plain index
+        clash = conn.execute(sa.text(
+            f'SELECT lower({column}) FROM "user" GROUP BY lower({column}) HAVING COUNT(*) > 1')).first()
+        if clash:
+            print(f"⚠ {column} values differ only in case (e.g. {clash[0]!r}); {name} is not unique")
+        op.create_index(name, 'user', [sa.text(f'lower({column})')], unique=not clash)
+
+
+def downgrade():
+    op.drop_index('ix_user_email_lower', table_name='user')
+    op.drop_index('ix_user_username_lower', table_name='user')
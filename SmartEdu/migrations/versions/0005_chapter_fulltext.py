@@ -0,0 +1,44 @@
+"""full-text index over book chapters
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # External-content FTS5 table: the text stays in chapter, the index holds only terms
+    op.execute("""CREATE VIRTUAL TABLE chapter_fts USING fts5(
+                      title, content, content='chapter', content_rowid='id',
+                      tokenize='porter unicode61 remove_diacritics 2')""")
+    # Triggers keep the index in step with every insert, edit and delete, including catalog upserts
+    op.execute("""CREATE TRIGGER chapter_fts_insert AFTER INSERT ON chapter BEGIN
+                      INSERT INTO chapter_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+                  END""")
+    op.execute("""CREATE TRIGGER chapter_fts_delete AFTER DELETE ON chapter BEGIN
+                      INSERT INTO chapter_fts (chapter_fts, rowid, title, content)
+                      VALUES ('delete', old.id, old.title, old.content);
+                  END""")
+    op.execute("""CREATE TRIGGER chapter_fts_update AFTER UPDATE OF title, content ON chapter BEGIN
+                      INSERT INTO chapter_fts (chapter_fts, rowid, title, content)
+                      VALUES ('delete', old.id, old.title, old.content);
+                      INSERT INTO chapter_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+                  END""")
+    op.execute("INSERT INTO chapter_fts (chapter_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER chapter_fts_update")
+    op.execute("DROP TRIGGER chapter_fts_delete")
+    op.execute("DROP TRIGGER chapter_fts_insert")
+    op.execute("DROP TABLE chapter_fts")
@@ -0,0 +1,25 @@
+"""covering index for a book's chapter table of contents
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Chapter numbers and titles without reading the (possibly megabytes of) chapter text
+    op.create_index('ix_chapter_toc', 'chapter', ['book_id', 'number', 'title'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_chapter_toc', table_name='chapter')
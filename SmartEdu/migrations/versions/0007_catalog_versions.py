@@ -0,0 +1,55 @@
+"""content version counters on courses, books and modules
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# (table, [(child table, foreign key column)]): a change to the table or to any of its
+# children bumps the table's version, which the page ETags are built from
+VERSIONED = [
+    ('course', []),
+    ('book', [('chapter', 'book_id')]),
+    ('module', [('quiz', 'module_id')]),
+]
+
+
+def upgrade():
+    for table, children in VERSIONED:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+        # Triggers rather than ORM hooks, so bulk catalog upserts and other workers' writes count too
+        op.execute(f"""CREATE TRIGGER {table}_version AFTER UPDATE ON {table}
+                       WHEN new.version = old.version BEGIN
+                           UPDATE {table} SET version = old.version + 1 WHERE id = new.id;
+                       END""")
+        for child, key in children:
+            op.execute(f"""CREATE TRIGGER {child}_version_insert AFTER INSERT ON {child} BEGIN
+                               UPDATE {table} SET version = version + 1 WHERE id = new.{key};
+                           END""")
+            op.execute(f"""CREATE TRIGGER {child}_version_update AFTER UPDATE ON {child} BEGIN
+                               UPDATE {table} SET version = version + 1 WHERE id IN (old.{key}, new.{key});
+                           END""")
+            op.execute(f"""CREATE TRIGGER {child}_version_delete AFTER DELETE ON {child} BEGIN
+                               UPDATE {table} SET version = version + 1 WHERE id = old.{key};
+                           END""")
+
+
+def downgrade():
+    for table, children in reversed(VERSIONED):
+        for child, _ in children:
+            for action in ('insert', 'update', 'delete'):
+                op.execute(f"DROP TRIGGER {child}_version_{action}")
+        op.execute(f"DROP TRIGGER {table}_version")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
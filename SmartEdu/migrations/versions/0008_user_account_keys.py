@@ -0,0 +1,61 @@
+"""case-folded username and email keys for login and signup
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+KEYS = (('ix_user_username_key', 'username_key', 'username', 80),
+        ('ix_user_email_key', 'email_key', 'email', 120))
+
+
+def account_key(value):
+    # Frozen copy of app.models.account_key as of this revision
+    return unicodedata.normalize('NFKC', value.strip()).casefold()
+
+
+def upgrade():
+    conn = op.get_bind()
+    for _, key, _, length in KEYS:
+        op.add_column('user', sa.Column(key, sa.String(length), nullable=True))
+    # SQLite's lower() folds only ASCII, so the keys are computed here rather than in SQL
+    rows = conn.execute(sa.text('SELECT id, username, email FROM "user"')).fetchall()
+    if rows:
+        conn.execute(sa.text('UPDATE "user" SET username_key = :username_key, email_key = :email_key WHERE id = :id'),
+                     [{'id': id, 'username_key': account_key(username), 'email_key': account_key(email)}
+                      for id, username, email in rows])
+    for name, key, column, _ in KEYS:
+        # Accounts differing only in case predate this rule; keep them, with a plain index
+        clash = conn.execute(sa.text(
+            f'SELECT {key} FROM "user" GROUP BY {key} HAVING COUNT(*) > 1')).first()
+        if clash:
+            print(f"⚠ {column} values differ only in case (e.g. {clash[0]!r}); {name} is not unique")
+        op.create_index(name, 'user', [key], unique=not clash)
+    op.drop_index('ix_user_username_lower', table_name='user')
+    op.drop_index('ix_user_email_lower', table_name='user')
+
+
+def downgrade():
+    conn = op.get_bind()
+    for name, _, _, _ in KEYS:
+        op.drop_index(name, table_name='user')
+    with op.batch_alter_table('user') as batch_op:
+        for _, key, _, _ in reversed(KEYS):
+            batch_op.drop_column(key)
+    # After the batch rebuild, which can't carry expression indexes across
+    for name, column in (('ix_user_username_lower', 'username'), ('ix_user_email_lower', 'email')):
+        clash = conn.execute(sa.text(
+            f'SELECT lower({column}) FROM "user" GROUP BY lower({column}) HAVING COUNT(*) > 1')).first()
+        op.create_index(name, 'user', [sa.text(f'lower({column})')], unique=not clash)
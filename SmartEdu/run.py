@@ -1,5 +1,8 @@
 # SmartEdu Application Entry Point
 from app import create_app
-app = create_app()
-app.run(debug=True)
+
+# Guarded so password-hashing pool processes started with spawn (macOS, Windows) don't re-run the server
+if __name__ == '__main__':
+    app = create_app()
+    app.run(debug=True)
     
\ No newline at end of file
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""Check that the chat cache keys near-identical questions together and different ones apart"""
+from app.main.chat_cache import ChatCache, normalize_prompt
+
+
+def key(prompt):
+    return ChatCache.key(prompt, 'model', 'system prompt')
+
+
+def test_languages_get_their_own_keys():
+    assert len({key("What is C?"), key("What is C++?"), key("What is C#?")}) == 3
+
+
+def test_operators_are_kept():
+    assert key("2+2") != key("2*2")
+    assert key("a == b") != key("a != b")
+
+
+def test_case_spacing_and_closing_punctuation_are_folded():
+    assert normalize_prompt("  What   is Python?? ") == normalize_prompt("what is python") == "what is python"
+    assert key("Explain recursion.") == key("explain RECURSION!")
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
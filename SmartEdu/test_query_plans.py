@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Check that the app's hot queries use their indexes (EXPLAIN QUERY PLAN)"""
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+os.environ.setdefault('DATABASE_FILE', os.path.join(tempfile.mkdtemp(), 'plans.db'))
+
+from app import create_app
+from app.models import db, User
+from app.catalog import get_course, get_book, get_chapter, get_chapter_titles, get_module, course_page, book_page
+from app.elearning.enrollment import my_courses
+from app.auth.accounts import find_login
+
+
+def captured(fn, *args, **kwargs):
+    """Run fn and return the (sql, params) of every statement it executed"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        fn(*args, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return statements
+
+
+def plan(statement, parameters):
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return ' | '.join(row[-1] for row in rows)
+
+
+def plans_for(call):
+    return [plan(sql, params) for sql, params in captured(call) if sql.lstrip().upper().startswith('SELECT')]
+
+
+def _user():
+    return User.query.first() or User(id=1)
+
+
+# (name, expected index, call)
+CHECKS = [
+    ("Course by slug", "ix_course_slug", lambda: get_course('python-basics')),
+    ("Book by slug", "ix_book_slug", lambda: get_book('algorithms')),
+    ("Chapter of a book", "sqlite_autoindex_chapter_1", lambda: get_chapter('algorithms', 2)),
+    ("Chapter table of contents", "COVERING INDEX ix_chapter_toc", lambda: get_chapter_titles('algorithms')),
+    ("Module for a course", "ix_module_course_module", lambda: get_module('python-basics', 'module1')),
+    ("Quiz questions of a module", "ix_quiz_module_order", lambda: get_module('python-basics', 'module1')),
+    ("Courses page by level", "ix_course_level_id", lambda: course_page(after=10, level='Beginner')),
+    ("Courses page by category", "ix_course_category_id", lambda: course_page(after=10, category='math')),
+    ("Books page by category", "ix_book_category_id", lambda: book_page(category='Computer Science')),
+    ("My courses", "sqlite_autoindex_enrollment_1", lambda: my_courses(_user())),
+    ("Login by username", "ix_user_username_key", lambda: find_login('Alice')),
+    ("Login by email", "ix_user_email_key", lambda: find_login('Alice@Example.com')),
+]
+
+
+def check(app, index, call):
+    """The query plans of call's SELECTs, and whether any of them uses index"""
+    with app.test_request_context():
+        plans = plans_for(call)
+    return any(index in p for p in plans), plans
+
+
+@pytest.fixture(scope='module')
+def app():
+    # Built when the first check runs, so collecting the tests opens no database
+    return create_app()
+
+
+@pytest.mark.parametrize('index, call', [check[1:] for check in CHECKS], ids=[check[0] for check in CHECKS])
+def test_query_uses_index(app, index, call):
+    used, plans = check(app, index, call)
+    assert used, f"{index} not used: {plans}"
+
+
+if __name__ == '__main__':
+    app = create_app()
+    print("\n📊 Checking query plans\n")
+    print("=" * 50)
+
+    failed = 0
+    for name, index, call in CHECKS:
+        used, plans = check(app, index, call)
+        failed += not used
+        print(f"{'✓' if used else '✗'} {name:28} [{index}]")
+        if not used:
+            for p in plans:
+                print(f"    {p}")
+
+    print("=" * 50)
+    print(f"\n{'✓ All queries use their indexes' if not failed else f'✗ {failed} queries missed their index'}\n")
+    sys.exit(1 if failed else 0)